@@ -0,0 +1,141 @@
+import numpy as np
+
+from a1.q2.q2 import bitvector_match, construct_mismatch_masks
+
+"""
+###### batch File Structure #####
+Construction Functions
+- as_record_array
+- construct_mask_matrix
+
+Main Algorithm Function
+- batch_bitvector_match
+
+Runs the bitvector_match update over many short records at once. Records are laid out as the rows of a
+padded NumPy array, the bit vectors of all records are a uint64 column, and the update is applied to one
+text position of every record per step, so the interpreter overhead is paid once per column rather than
+once per character of every record.
+"""
+
+WORD_SIZE = 64  ## bits in a uint64 bit vector, the longest pattern handled by the vectorised update
+BATCH_SIZE = 1 << 16  ## records processed per step, bounding the size of the mask matrix
+
+
+def as_record_array(records):
+    """
+    Lays out records as the rows of a 2D array of character codes, padded on the right.
+
+    Parameters:
+    - records (list or ndarray of str or bytes): The records. A NumPy array with a str or bytes dtype is
+      used without copying. As in NumPy's fixed width strings, trailing NUL characters are not kept.
+
+    Returns:
+    - tuple: (codes, lengths), where codes is an array of shape (number of records, longest record) holding
+      uint32 code points (str) or uint8 bytes, and lengths holds the length of each record.
+    """
+    array = np.asarray(records)
+    if array.dtype.kind == "U":
+        codes = array.view(np.uint32)
+    else:
+        codes = array.view(np.uint8)
+    return codes.reshape(len(array), -1), np.char.str_len(array)
+
+
+def construct_mask_matrix(codes, lengths, pat):
+    """
+    Looks up the mismatch mask (see construct_mismatch_masks) of every character of every record.
+
+    Parameters:
+    - codes (ndarray): Character codes of the records, as returned by as_record_array.
+    - lengths (ndarray): The length of each record.
+    - pat (str or bytes): The pattern, of at most WORD_SIZE characters.
+
+    Returns:
+    - ndarray: uint64 masks of the same shape as codes.T, so that each text position of every record is one
+      contiguous row. Padding positions, like characters that do not
+      occur in pat, take the all ones mask, so a record never matches past its end.
+    """
+    m = len(pat)
+    full = np.uint64((1 << m) - 1)
+    masks = {
+        (ord(character) if isinstance(character, str) else character): mask
+        for character, mask in construct_mismatch_masks(pat).items()
+    }
+
+    ## Sorted codes of the distinct pattern characters, with their masks in the same order
+    alphabet = sorted(masks)
+    alphabet_codes = np.array(alphabet, dtype=codes.dtype)
+    alphabet_masks = np.array([masks[code] for code in alphabet], dtype=np.uint64)
+
+    ## Match each code to its place in the pattern alphabet, keeping only exact hits inside the record
+    codes = np.ascontiguousarray(codes.T)
+    index = np.minimum(np.searchsorted(alphabet_codes, codes), len(alphabet_codes) - 1)
+    hit = alphabet_codes[index] == codes
+    hit &= np.arange(codes.shape[0])[:, None] < lengths
+    return np.where(hit, alphabet_masks[index], full)
+
+
+def batch_bitvector_match(records, pat, batch_size=BATCH_SIZE):
+    """
+    Finds the first occurrence of pat in each of many records.
+
+    Each step applies the bitvector_match update, bitvector = ((bitvector << 1) | delta) & full, to one
+    column of the mask matrix, advancing every record in the batch by one character. Records whose first
+    match has been found take no further part, and a batch stops as soon as every record has matched.
+    Patterns longer than WORD_SIZE do not fit a uint64 bit vector, so those fall back to one bitvector_match
+    call per record.
+
+    Parameters:
+    - records (list or ndarray of str or bytes): The records to search (see as_record_array).
+    - pat (str or bytes): The pattern to search for within each record.
+    - batch_size (int): The number of records processed together.
+
+    Returns:
+    - ndarray: For each record, the start position of its first match in 1-indexing, or 0 if pat does not
+      occur in it. (result > 0) gives a boolean result per record.
+
+    Time Complexity: O(RL / batch_size) vectorised steps over batch_size records each, for R records where
+    L is the average over batches of the longest record in each batch.
+
+    Space Complexity: O(batch_size * L) for the masks of one batch, where L is the longest record in that
+    batch, so a single long record only widens its own batch.
+    """
+    m = len(pat)
+    if m > WORD_SIZE:
+        return np.array([next(bitvector_match(record, pat), 0) for record in records], dtype=np.int64)
+
+    result = np.zeros(len(records), dtype=np.int64)
+    if m == 0:
+        return result
+
+    full = np.uint64((1 << m) - 1)
+    found = np.uint64(1 << (m - 1))
+    one = np.uint64(1)
+
+    for start in range(0, len(records), batch_size):
+        stop = min(start + batch_size, len(records))
+
+        ## Lay out each batch separately, so it is only as wide as its own longest record
+        codes, lengths = as_record_array(records[start:stop])
+        width = int(lengths.max())
+        if width < m:
+            continue
+        masks = construct_mask_matrix(codes[:, :width], lengths, pat)
+        first = result[start:stop]  ## view, so results are written in place
+
+        ## No prefix has matched before the start of any record
+        bitvectors = np.full(stop - start, full, dtype=np.uint64)
+        for j in range(width):
+            bitvectors <<= one
+            bitvectors |= masks[j]
+            bitvectors &= full
+
+            ## Record the first match of every record whose bit m-1 has just become 0
+            matched = (bitvectors & found) == 0
+            if matched.any():
+                matched &= first == 0
+                first[matched] = j - m + 2  ## 1-indexing
+                if first.all():
+                    break
+
+    return result
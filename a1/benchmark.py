@@ -0,0 +1,215 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from a1.candidate_filter import candidate_match
+from a1.kmp import kmp_match
+from a1.q1.q1 import SearchStatistics, compile_pattern, reverse_boyer_moore, z_match
+from a1.q2.q2 import bitvector_match
+
+"""
+###### benchmark File Structure #####
+Text Generators
+- generate_random
+- generate_dna
+- generate_english
+- generate_ascii
+- generate_periodic
+
+Measurement Functions
+- measure
+- run_benchmarks
+
+Terminal Usage
+- python -m a1.benchmark [--alphabets ...] [--sizes ...] [--lengths ...] [--engines ...] [--output file]
+
+Every generator is seeded, so the same arguments always produce the same texts and patterns. Each pattern is
+cut from its text at a seeded offset, so it occurs at least once. Results are written as JSON: one record per
+(alphabet, text size, pattern length, engine) with throughput, peak traced memory and, for reverse_boyer_moore,
+character comparisons.
+"""
+
+HAMLET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "a2", "hamlet.txt")
+BLOCK_SIZE = 1 << 20  ## characters generated at a time, so large texts never exist as a list of characters
+
+
+def read_file(file_path: str) -> str:
+    with open(file_path, "r", encoding="utf-8") as file:
+        return file.read()
+
+
+def generate_random(alphabet, size, seed):
+    """Uniformly random text of size characters over alphabet."""
+    rng = random.Random(seed)
+    blocks = []
+    for start in range(0, size, BLOCK_SIZE):
+        blocks.append("".join(rng.choices(alphabet, k=min(BLOCK_SIZE, size - start))))
+    return "".join(blocks)
+
+
+def generate_dna(size, seed):
+    """Random text over ACGT (σ = 4)."""
+    return generate_random("ACGT", size, seed)
+
+
+def generate_english(size, seed):
+    """English text: a2/hamlet.txt repeated to size characters, starting at a seeded offset."""
+    hamlet = read_file(HAMLET_PATH)
+    start = random.Random(seed).randrange(len(hamlet))
+    repeats = (start + size) // len(hamlet) + 1
+    return (hamlet * repeats)[start : start + size]
+
+
+def generate_ascii(size, seed):
+    """Random printable ASCII text, "!" to "~" (σ = 94)."""
+    return generate_random([chr(c) for c in range(ord("!"), ord("~") + 1)], size, seed)
+
+
+def generate_periodic(size, seed):
+    """Highly periodic text: a single character repeated, the worst case for skip-based engines."""
+    return "a" * size
+
+
+GENERATORS = {
+    "dna": generate_dna,
+    "english": generate_english,
+    "ascii": generate_ascii,
+    "periodic": generate_periodic,
+}
+
+ENGINES = {
+    "reverse_boyer_moore": reverse_boyer_moore,
+    "reverse_boyer_moore_galil": lambda txt, pat: reverse_boyer_moore(txt, pat, galil=True),
+    "bitvector_match": bitvector_match,
+    "z_match": z_match,
+    "kmp_match": kmp_match,
+    "candidate_match": candidate_match,
+}
+
+
+def measure(engine, txt, pat, memory=True):
+    """
+    Runs one search and measures it.
+
+    Parameters:
+    - engine (str): A key of ENGINES.
+    - txt (str): Target text for pattern search.
+    - pat (str): Pattern sought within the text.
+    - memory (bool): Whether to repeat the search under tracemalloc to find its peak memory. The traced run is
+      separate so that tracing does not slow the timed run.
+
+    The compiled pattern cache is cleared before both the timed and the traced run, so reverse_boyer_moore
+    builds its tables inside each of them, as every other engine does, whichever engine ran before it.
+
+    For reverse_boyer_moore, the repeated run also counts comparisons, so the search runs at most twice.
+
+    Returns:
+    - dict: matches, seconds, mb_per_s, peak_memory_bytes (None without memory) and comparisons (None for
+      engines other than reverse_boyer_moore).
+    """
+    search = ENGINES[engine]
+
+    compile_pattern.cache_clear()
+    start = time.perf_counter()
+    matches = sum(1 for _ in search(txt, pat))
+    seconds = time.perf_counter() - start
+
+    stats = None
+    if engine.startswith("reverse_boyer_moore"):
+        stats = SearchStatistics()
+        galil = engine.endswith("galil")
+        search = lambda txt, pat: reverse_boyer_moore(txt, pat, galil=galil, stats=stats)
+
+    peak = None
+    if memory:
+        compile_pattern.cache_clear()
+        tracemalloc.start()
+        sum(1 for _ in search(txt, pat))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    elif stats is not None:
+        sum(1 for _ in search(txt, pat))
+
+    comparisons = None if stats is None else stats.comparisons
+
+    return {
+        "matches": matches,
+        "seconds": seconds,
+        "mb_per_s": len(txt) / 1e6 / seconds if seconds > 0 else None,
+        "peak_memory_bytes": peak,
+        "comparisons": comparisons,
+    }
+
+
+def run_benchmarks(alphabets, sizes, lengths, engines, seed=0, memory=True):
+    """
+    Measures every engine on every combination of alphabet, text size and pattern length.
+
+    Returns:
+    - list of dict: One record per measurement, holding its alphabet, text_size, pattern_length and engine
+      together with the fields returned by measure.
+    """
+    results = []
+    for alphabet in alphabets:
+        for size in sizes:
+            txt = GENERATORS[alphabet](size, seed)
+            rng = random.Random(seed)
+            for length in lengths:
+                if length > size:
+                    continue
+                offset = rng.randrange(size - length + 1)
+                pat = txt[offset : offset + length]
+                for engine in engines:
+                    record = {"alphabet": alphabet, "text_size": size, "pattern_length": length, "engine": engine}
+                    record.update(measure(engine, txt, pat, memory))
+                    results.append(record)
+    return results
+
+
+def machine_description():
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def parse_arguments(argv):
+    parser = argparse.ArgumentParser(description="Benchmark the exact matching engines in a1.")
+    parser.add_argument("--alphabets", nargs="+", default=list(GENERATORS), choices=list(GENERATORS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10**5, 10**6])
+    parser.add_argument("--lengths", nargs="+", type=int, default=[4, 16, 64, 256])
+    parser.add_argument("--engines", nargs="+", default=list(ENGINES), choices=list(ENGINES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="skip the traced memory runs")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    arguments = parse_arguments(sys.argv[1:])
+    report = {
+        "machine": machine_description(),
+        "seed": arguments.seed,
+        "results": run_benchmarks(
+            arguments.alphabets,
+            arguments.sizes,
+            arguments.lengths,
+            arguments.engines,
+            arguments.seed,
+            arguments.memory,
+        ),
+    }
+
+    if arguments.output:
+        with open(arguments.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
@@ -0,0 +1,82 @@
+import numpy as np
+
+"""
+###### candidate_filter File Structure #####
+Construction Functions
+- as_code_array
+- select_filter_positions
+
+Main Algorithm Function
+- candidate_match
+
+candidate_match has the same signature and output as bitvector_match, so it can be used anywhere an
+exact matching engine is expected (including as the engine of parallel_search).
+"""
+
+
+def as_code_array(string):
+    """
+    Returns a NumPy view of the characters of string: a uint8 view for bytes, or the uint32 code points
+    of a str, so that every element of the array is one character at the same offset as in string.
+    """
+    if isinstance(string, str):
+        return np.frombuffer(string.encode("utf-32-le"), dtype="<u4")
+    return np.frombuffer(string, dtype=np.uint8)
+
+
+def select_filter_positions(T, P):
+    """
+    Chooses the pattern positions whose characters are compared against the text to filter alignments:
+    the first character, the last character and the character that is rarest in the text.
+
+    Parameters:
+    - T (ndarray): Code array of the text.
+    - P (ndarray): Code array of the pattern.
+
+    Returns:
+    - list: Distinct positions in pat, in increasing order.
+    """
+    frequencies = np.bincount(T, minlength=int(P.max()) + 1)
+    rarest = int(np.argmin(frequencies[P]))
+    return sorted({0, len(P) - 1, rarest})
+
+
+def candidate_match(txt, pat):
+    """
+    Finds all occurrences of pat in txt by first filtering alignments with vectorised comparisons, then
+    verifying the survivors in Python.
+
+    An alignment s can only be a match if txt[s + p] == pat[p] for every filter position p. Each such test is
+    one NumPy equality over the n - m + 1 alignments, and the masks are ANDed together. On typical text, where
+    the first, last and rarest pattern characters rarely line up by chance, only a handful of alignments survive
+    and are checked with a direct slice comparison.
+
+    Parameters:
+    - txt (str or bytes): The text in which to search for the pattern.
+    - pat (str or bytes): The pattern to search for within the text, of the same type as txt.
+
+    Yields:
+    - int: The start position of each match in 1-indexing, from left to right.
+
+    Time Complexity: O(n) vectorised work for the filter plus O(m) per surviving candidate,
+    so O(mn) in the worst case when every alignment survives.
+
+    Space Complexity: O(n) for the code arrays and the candidate mask.
+    """
+    m, n = len(pat), len(txt)
+    if n < m or m == 0:
+        return
+
+    T = as_code_array(txt)
+    P = as_code_array(pat)
+    alignments = n - m + 1
+
+    ## AND together the equality masks of every filter position
+    mask = np.ones(alignments, dtype=bool)
+    for p in select_filter_positions(T, P):
+        mask &= T[p : p + alignments] == P[p]
+
+    ## Verify each surviving alignment directly
+    for s in np.flatnonzero(mask).tolist():
+        if txt[s : s + m] == pat:
+            yield s + 1  ## 1-indexing
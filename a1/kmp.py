@@ -0,0 +1,121 @@
+from array import array
+
+from a1.q1.q1 import calculate_z_array
+
+"""
+###### kmp File Structure #####
+Construction Functions
+- construct_failure_function
+- construct_automaton
+
+Main Algorithm Functions
+- kmp_match
+- stream_kmp_match
+
+A forward-only exact matching engine. Unlike reverse_boyer_moore, which scans the text from right to left, it
+reads each character once, in order, and keeps a single automaton state, so it can run on sockets and pipes
+that cannot be read backwards.
+"""
+
+
+def construct_failure_function(pat):
+    """
+    Derives the KMP failure function of pat from its Z-array, such that sp[i] is the length of the longest
+    proper suffix of pat[0...i] that is also a prefix of pat and is followed by a character different from
+    pat[i+1] (for i = m-1, simply the longest proper suffix that is also a prefix).
+
+    A Z-box starting at j covers the prefix pat[0...Z[j]-1] ending at j + Z[j] - 1 and stops at a mismatch, so
+    sp[j + Z[j] - 1] is the largest Z[j] ending there. Iterating j from right to left leaves the largest value.
+
+    Parameters:
+    - pat (str): The pattern for which the failure function is constructed.
+
+    Returns:
+    - sp (array('i')): The failure function of pat.
+    """
+    m = len(pat)
+    zp = calculate_z_array(pat)
+    sp = array("i", [0]) * m
+
+    for j in range(m - 1, 0, -1):
+        if zp[j] > 0:
+            sp[j + zp[j] - 1] = zp[j]
+
+    return sp
+
+
+def construct_automaton(pat):
+    """
+    Constructs the string matching automaton of pat over the characters that occur in it. State q means the
+    longest prefix of pat that ends at the current text position has length q, and state m is a full match.
+
+    From state q, pat[q] leads to state q + 1. Any other character leads where it would from state sp[q-1],
+    as the longest border of pat[0...q-1] that is not followed by pat[q] is the next prefix that could still
+    be extended.
+
+    Parameters:
+    - pat (str): The pattern for which the automaton is constructed.
+
+    Returns:
+    - delta (list of dict): delta[q] maps each character to the state it leads to from state q. Characters
+      without an entry lead to state 0.
+    """
+    m = len(pat)
+    sp = construct_failure_function(pat)
+    delta = [{pat[0]: 1}]
+
+    for q in range(1, m + 1):
+        transitions = dict(delta[sp[q - 1]])
+        if q < m:
+            transitions[pat[q]] = q + 1
+        delta.append(transitions)
+
+    return delta
+
+
+def kmp_match(txt, pat):
+    """
+    Finds all occurrences of pat in txt with the KMP automaton (see stream_kmp_match).
+
+    Parameters:
+    - txt (str): Target text for pattern search.
+    - pat (str): Pattern sought within the text.
+
+    Yields:
+    - int: The start position of each match in 1-indexing, from left to right.
+    """
+    yield from stream_kmp_match((txt,), pat)
+
+
+def stream_kmp_match(chunks, pat):
+    """
+    Runs the automaton of pat over text that arrives as a sequence of chunks, one character at a time. Each
+    character costs a single transition lookup, with no backtracking over the text, and only the current
+    state is kept between chunks.
+
+    Parameters:
+    - chunks (iterable of str): The text to search, in order, such as the output of read_chunks.
+    - pat (str): Pattern sought within the text.
+
+    Yields:
+    - int: The start position of each match in 1-indexing, relative to the start of the stream.
+
+    Time Complexity: O(n) after O(mσ) preprocessing, where σ is the number of distinct characters of pat.
+
+    Space Complexity: O(mσ) for the automaton.
+    """
+    m = len(pat)
+    if m == 0:
+        return
+
+    delta = construct_automaton(pat)
+    state = 0
+    offset = -m + 2  ## added to a 0-indexed end position to give a 1-indexed start position
+
+    for chunk in chunks:
+        for j, character in enumerate(chunk, offset):
+            state = delta[state].get(character, 0)
+            if state == m:
+                yield j
+
+        offset += len(chunk)
@@ -0,0 +1,111 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from a1.q1.q1 import reverse_boyer_moore
+
+"""
+###### parallel File Structure #####
+Worker Functions
+- _search_segment
+
+Main Driver Function
+- parallel_search
+
+The driver splits the text into one segment per process. Segment s is responsible for the matches that
+start inside it, so it is searched together with the m - 1 characters that follow it. The text is placed in
+shared memory once (UTF-32 for str, raw for bytes) and each worker copies out only its own segment, so the
+text is never pickled.
+"""
+
+STR_ENCODING = "utf-32-le"  ## fixed width encoding so character offsets map directly to byte offsets
+STR_WIDTH = 4
+
+
+def _search_segment(shm_name, width, start, stop, pat, engine):
+    """
+    Runs engine over txt[start...stop-1], read from the shared memory block shm_name.
+
+    Parameters:
+    - shm_name (str): Name of the shared memory block holding the text.
+    - width (int): Bytes per character in the block, STR_WIDTH for str text and 1 for bytes.
+    - start (int): Offset of the first character of the segment in the text.
+    - stop (int): Offset one past the last character of the segment, including the m - 1 overlap.
+    - pat (str or bytes): Pattern sought within the segment.
+    - engine (function): reverse_boyer_moore or bitvector_match.
+
+    Returns:
+    - list: Match start positions in 1-indexing, relative to the whole text.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        segment = bytes(shm.buf[start * width : stop * width])
+    finally:
+        shm.close()
+
+    if width == STR_WIDTH:
+        segment = segment.decode(STR_ENCODING)
+    return [start + position for position in engine(segment, pat)]
+
+
+def parallel_search(txt, pat, engine=reverse_boyer_moore, processes=None):
+    """
+    Searches for pat in txt by running engine on overlapping segments of txt in a process pool.
+
+    Parameters:
+    - txt (str or bytes): Target text for pattern search.
+    - pat (str or bytes): Pattern sought within the text, of the same type as txt.
+    - engine (function): The exact matcher run on each segment, reverse_boyer_moore or bitvector_match.
+    - processes (int): The number of worker processes. Defaults to os.cpu_count().
+
+    Returns:
+    - list: The start position of each match in 1-indexing, in increasing order and without duplicates.
+
+    Time Complexity: the engine's complexity on a segment of n/p + m - 1 characters, per process.
+
+    Space Complexity: O(n) shared between all processes, plus O(n/p + m) per process for its segment.
+    """
+    m, n = len(pat), len(txt)
+    if n < m or m == 0:
+        return []
+
+    if isinstance(txt, str):
+        data, width = txt.encode(STR_ENCODING), STR_WIDTH
+    else:
+        data, width = txt, 1
+
+    ## No more segments than there are alignments of pat in txt
+    processes = processes or os.cpu_count() or 1
+    segments = min(processes, n - m + 1)
+    segment_length = -(-n // segments)  ## ceiling division
+
+    shm = shared_memory.SharedMemory(create=True, size=len(data))
+    try:
+        shm.buf[: len(data)] = data
+        del data
+
+        with ProcessPoolExecutor(max_workers=segments) as executor:
+            futures = [
+                executor.submit(
+                    _search_segment,
+                    shm.name,
+                    width,
+                    start,
+                    min(start + segment_length + m - 1, n),
+                    pat,
+                    engine,
+                )
+                for start in range(0, n, segment_length)
+            ]
+
+            ## Segments are in text order, so sorting each one keeps the merged list ordered
+            matches = []
+            for future in futures:
+                for position in sorted(future.result()):
+                    if not matches or position > matches[-1]:
+                        matches.append(position)
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return matches
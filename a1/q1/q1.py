@@ -1,4 +1,11 @@
+import mmap
+import os
 import sys
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from functools import lru_cache
+from itertools import islice
 
 """
 ###### Metadata #####
@@ -12,17 +19,37 @@ Terminal Usage Functions
 - read_file (written by Arun, I take no ownership of this function)
 
 Construction Functions
-- calculate_z_array
-- construct_bad_character_matrix
+- calculate_z_array (shared Z-function core, also used by w2)
+- IncrementalZArray (calculate_z_array for a string that grows by appending)
+- construct_bad_character_table
 - construct_good_prefix_array
 - construct_match_suffix_array
 
+Compiled Patterns
+- CompiledPattern
+- compile_pattern (bounded LRU cache of CompiledPattern, keyed by pattern)
+
+Instrumentation
+- SearchStatistics
+
 Auxillary Functions
 - calculate_suffix_shift
 - calculate_character_shift
 
-Main Algorithm Function
+Main Algorithm Functions
 - reverse_boyer_moore
+- z_match
+
+File Search Functions
+- search_file
+
+Query Functions
+- count_matches
+- first_matches
+- has_match
+
+Output Functions
+- write_matches
 """
 
 
@@ -36,24 +63,27 @@ def calculate_z_array(string):
     Computes the Z-array for a given string. The Z-array is a list where Z[i] represents the length
     of the longest substring starting from S[i] that matches a prefix of S. Z[0] is defined as 0.
 
+    This is the shared Z-function core: it indexes string directly rather than copying it, so any
+    sequence works, including str, bytes, memoryview and mmap objects.
+
     Parameters:
-    - string (str): The input string for which the Z-array is to be calculated.
+    - string (str, bytes or memoryview): The input string for which the Z-array is to be calculated.
 
     Returns:
-    - list: The Z-array for the given string. Each element Z[i] contains the length of the longest
+    - array('i'): The Z-array for the given string. Each element Z[i] contains the length of the longest
       substring starting at S[i] which is also a prefix of S.
     """
-    S = list(string)
-    Z = [0 for i in range(len(S))]
+    S = string
+    n = len(S)
+    Z = array("i", [0]) * n
     L = R = 0
-    ## take the z-value of the first character as 0
-    Z[0] = 0
+    ## the z-value of the first character is left as 0
 
-    for K in range(1, len(S)):
+    for K in range(1, n):
         ## outside current Z-box: calculate Z[K] by direct comparison
         if K > R:
             L = R = K
-            while R < len(S) and S[R] == S[R - L]:
+            while R < n and S[R] == S[R - L]:
                 ## while no mismatch, keep expanding z-box
                 R += 1
             Z[K] = R - L
@@ -71,7 +101,7 @@ def calculate_z_array(string):
             ## possible extension beyond current Z-box
             else:
                 L = K
-                while R < len(S) and S[R] == S[R - L]:
+                while R < n and S[R] == S[R - L]:
                     R += 1
                 Z[K] = R - L
                 R -= 1
@@ -79,42 +109,180 @@ def calculate_z_array(string):
     return Z
 
 
-def construct_bad_character_matrix(pat, ascii_range=94):
+def z_match(txt, pat):
     """
-    Constructs the bad character matrix R using extended bad character rule such that
-    R[i][j] = the leftmost occurrence of character "i" to the right of index "j"
+    Finds all occurrences of pat in txt with the Z-algorithm, without building pat + '$' + txt.
+
+    Only the Z-array of pat is stored. The text is scanned with a single Z-box [L...R) such that
+    txt[L...R-1] == pat[0...R-L-1]. At text position k inside the box, Z[k-L] gives the match length
+    directly unless it reaches the right edge of the box, in which case the box is extended by direct
+    comparison from R. R never moves left, so every text character is compared O(1) times.
 
     Parameters:
-    - pat (str): The pattern for which the bad character shift matrix is constructed.
-    - ascii_range (int): The range of ASCII values considered. Defaults to 94, covering the printable characters.
+    - txt (str, bytes or memoryview): Target text for pattern search.
+    - pat (str, bytes or memoryview): Pattern sought within the text.
 
-    Returns:
-    - R (list of lists): A 2D list representing the bad character shift matrix. Each row corresponds to an ASCII
-      character (offset by '!' to include only printable characters), and each column to a position in the pattern.
-      The value at R[i][j] is the leftmost index of character i in the pattern, to the right of position j in the
-      pattern, or -1 if the character does not occur to the right of j.
+    Yields:
+    - int: The start position of each match in 1-indexing, from left to right.
+
+    Time Complexity: O(n + m)
 
-    The matrix is constructed by iterating through the pattern in reverse order, ensuring that for each character,
-    the closest position to the right (i.e., towards the beginning of the pattern when processed in reverse) is recorded.
+    Space Complexity: O(m), for the Z-array of pat.
     """
-    m = len(pat)
-    ## initialise R to -1, indiciating no position exists
-    R = [[-1 for _ in range(m)] for _ in range(ascii_range)]
+    m, n = len(pat), len(txt)
+    if n < m or m == 0:
+        return
 
-    for i in range(m):
-        ## adjust ASCII value to printable index range
-        asci = ord(pat[i]) - ord("!")
+    zp = calculate_z_array(pat)
+    L = R = 0  ## txt[L...R-1] matches pat[0...R-L-1]
 
-        ## iterate in reverse to find leftmost occurence from the right
-        for j in range(i - 1, -1, -1):
-            # if not already set mark leftmost occurence
-            if R[asci][j] == -1:
-                R[asci][j] = i
+    for k in range(n - m + 1):
+        ## inside the Z-box, and the mirrored match ends before its right edge: no full match here
+        if k < R and zp[k - L] < R - k:
+            continue
 
-            ## break if already set, optimizing for leftmost requirement
-            else:
+        ## otherwise extend a Z-box starting at k, reusing the part of the old box that is known to match
+        L = k
+        R = max(R, k)
+        while R < n and R - L < m and txt[R] == pat[R - L]:
+            R += 1
+
+        if R - L == m:
+            yield k + 1  ## 1-indexing
+
+
+class IncrementalZArray:
+    """
+    Maintains the Z-array of a string that grows by appending, so that each append costs time proportional
+    to the characters added rather than the total length.
+
+    This runs calculate_z_array online. Z[K] is final once its Z-box ends in a mismatch. When the Z-box of the
+    next position reaches the end of the string, its value can still grow, so the computation pauses there and
+    resumes extending that Z-box when more characters are appended. R never moves left, so the total work over
+    all appends is O(n).
+
+    Attributes:
+        string (list): The characters appended so far.
+        Z (array('i')): The final Z-values, Z[0...K-1].
+        K (int): The first position whose Z-value is not yet final.
+        L, R (int): The current Z-box, string[L...R-1] == string[0...R-L-1].
+
+    Methods:
+        extend: Appends characters and finalises every Z-value they determine.
+        finish: Treats the end of the string as a mismatch, finalising every remaining Z-value.
+        occurrences: Yields every position at which a prefix of a given length occurs in the string so far.
+    """
+
+    def __init__(self, string=""):
+        self.string = []
+        self.Z = array("i")
+        self.K = 0
+        self.L = 0
+        self.R = 0
+        self.extend(string)
+
+    def __len__(self):
+        return len(self.string)
+
+    def __getitem__(self, i):
+        return self.Z[i]
+
+    def extend(self, characters):
+        """
+        Appends characters (a str, bytes or other sequence) and advances the Z-array as far as they allow.
+        """
+        self.string.extend(characters)
+        if self.string and self.K == 0:
+            self.Z.append(0)  ## the z-value of the first character is taken as 0
+            self.K = 1
+        self._advance(final=False)
+
+    def finish(self):
+        """
+        Marks the end of the input. Every remaining Z-value is finalised, after which Z equals
+        calculate_z_array(string).
+        """
+        self._advance(final=True)
+
+    def occurrences(self, length, start=0):
+        """
+        Yields every position i >= start at which string[0...length-1] occurs in the string appended so far,
+        in increasing order.
+
+        Below K this is Z[i] >= length. From K on, the computation is paused on a Z-box string[K...n-1] that
+        matches string[0...n-K-1], so an occurrence at i >= K that ends within the string is an occurrence at
+        i - K, and so on down to (i - K) mod K, which is read off Z (position 0 always matches).
+        The pending Z-box therefore reports its occurrences as soon as their characters have arrived.
+
+        Every position up to len(self) - length is decided by the time of the call, so passing that plus one
+        as the next start tails a growing input, visiting only the positions that new characters can affect.
+        """
+        Z, K = self.Z, self.K
+        n = len(self.string)
+
+        for i in range(max(start, 1), K):
+            if Z[i] >= length:
+                yield i
+
+        for i in range(max(start, K, 1), n - length + 1):
+            d = (i - K) % K
+            if d == 0 or Z[d] >= length:
+                yield i
+
+    def _advance(self, final):
+        S, Z = self.string, self.Z
+        n = len(S)
+        K, L, R = self.K, self.L, self.R  ## R is exclusive here
+
+        while K < n:
+            ## K == L only when resuming a Z-box that previously reached the end of the string
+            if K != L:
+                ## inside current Z-box: use the mirrored value if it ends before the box does
+                if K < R and Z[K - L] < R - K:
+                    Z.append(Z[K - L])
+                    K += 1
+                    continue
+                L = K
+                R = max(R, K)
+
+            ## extend the Z-box by direct comparison
+            while R < n and S[R] == S[R - L]:
+                R += 1
+
+            ## the Z-box reached the end of the string, so Z[K] can still grow: wait for more characters
+            if R == n and not final:
                 break
 
+            Z.append(R - L)
+            K += 1
+
+        self.K, self.L, self.R = K, L, R
+
+
+def construct_bad_character_table(pat):
+    """
+    Constructs the bad character table R using extended bad character rule such that
+    R[c] lists, in increasing order, every position of character "c" in the pattern. The leftmost
+    occurrence of "c" to the right of index "j" is then found by binary search over R[c].
+
+    Parameters:
+    - pat (str or bytes): The pattern for which the bad character table is constructed. Any hashable
+      element type works, so the full byte and Unicode alphabets are covered.
+
+    Returns:
+    - R (dict): Maps each distinct character of the pattern to an array('i') of its positions in the pattern,
+      sorted in increasing order. Characters that do not occur in the pattern have no entry.
+
+    The table holds exactly m positions in total, so memory scales with the pattern and the characters that
+    occur in it rather than with the size of the alphabet.
+    """
+    R = {}
+    for i in range(len(pat)):
+        ## positions are visited left to right, so each array is built in sorted order
+        if pat[i] not in R:
+            R[pat[i]] = array("i")
+        R[pat[i]].append(i)
+
     return R
 
 
@@ -153,19 +321,19 @@ def construct_good_prefix_array(pat):
 def construct_match_suffix_array(pat):
     """
     Computes the match suffix array for a given pattern such that ms[i]
-    contains the length of the longest substring within pat[0...i] that is also a suffix of pat.
+    contains the length of the longest prefix of pat[0...i] that is also a suffix of pat.
 
     First I use the Z-algorithm on the reversed pattern to determine these
-    suffix lengths, then I iterate through the pattern to populate the match suffix array, ensuring
-    each entry ms[i] holds the maximum value derived from either its own Z-value or the preceding
-    value in ms, therefore capturing the longest relevant suffix at each step.
+    suffix lengths, then I iterate through the pattern to populate the match suffix array. Only prefixes
+    pat[0...i] whose Z-value covers the whole prefix are suffixes of pat, so ms[i] takes i + 1 for those and
+    otherwise carries ms[i - 1] forward, therefore capturing the longest relevant suffix at each step.
 
     Parameters:
     - pat (str): The pattern for which the match suffix array is to be calculated.
 
     Returns:
     - ms (list): The match suffix array where each element, ms[i], indicates the length of the largest
-      substring within pat[0...i] that matches a suffix of pat. The last element, ms[len(pat) - 1],
+      prefix of pat[0...i] that matches a suffix of pat. The last element, ms[len(pat) - 1],
       is explicitly set to the full length of pat as the entire pattern is a suffix of itself.
     """
 
@@ -175,12 +343,105 @@ def construct_match_suffix_array(pat):
     z_values = calculate_z_array(pat[::-1])[::-1]
 
     for i in range(len(pat)):
-        ## take max of new value or previous value
-        ms[i] = max(z_values[i], ms[i - 1])
+        ## pat[0...i] is itself a suffix of pat only if its Z-value reaches back to pat[0]
+        if z_values[i] == i + 1:
+            ms[i] = i + 1
+        ## otherwise carry the previous value forward
+        else:
+            ms[i] = ms[i - 1]
     ms[len(pat) - 1] = len(pat)
     return ms
 
 
+class CompiledPattern:
+    """
+    Holds the preprocessed shift tables of a pattern so that the pattern can be searched for
+    in many texts while only constructing its tables once.
+
+    Attributes:
+        pat (str): The pattern the tables were constructed for.
+        gp (list): The good prefix array of pat.
+        mp (list): The match suffix array of pat.
+        bct (dict): The bad character table of pat.
+    """
+
+    def __init__(self, pat):
+        self.pat = pat
+        self.gp = construct_good_prefix_array(pat)
+        self.mp = construct_match_suffix_array(pat)
+        self.bct = construct_bad_character_table(pat)
+
+    def __repr__(self):
+        return f"CompiledPattern({self.pat!r})"
+
+
+PATTERN_CACHE_SIZE = 128  ## number of compiled patterns kept by compile_pattern
+
+
+@lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def compile_pattern(pat):
+    """
+    Returns the CompiledPattern for pat, reusing a previously compiled one if pat is among the
+    PATTERN_CACHE_SIZE most recently used patterns.
+    """
+    return CompiledPattern(pat)
+
+
+class SearchStatistics:
+    """
+    Opt-in counters describing how a reverse_boyer_moore search spent its time. Pass an instance as
+    the stats argument of reverse_boyer_moore; it is updated once per alignment, never inside the
+    comparison loop, so searches without stats are unaffected.
+
+    Attributes:
+        alignments (int): Number of alignments of the pattern against the text that were examined.
+        comparisons (int): Number of character comparisons between pat and txt.
+        skipped_comparisons (int): Number of comparisons avoided by the start/stop verified regions.
+        rule_counts (Counter): Number of shifts taken by each rule, keyed by "good_prefix",
+            "match_suffix", "bad_character" and "full_match".
+        shift_histogram (Counter): Number of shifts taken of each length.
+
+    Methods:
+        record_alignment: Records the comparisons made at one alignment.
+        record_shift: Records the rule and length of one shift.
+        as_dict: Returns the counters as a plain dictionary.
+    """
+
+    def __init__(self):
+        self.alignments = 0
+        self.comparisons = 0
+        self.skipped_comparisons = 0
+        self.rule_counts = Counter()
+        self.shift_histogram = Counter()
+
+    def record_alignment(self, i, start, stop, m):
+        """
+        Records an alignment that ended at pattern position i (i == m for a full match) while the
+        verified region pat[start...stop] was in force.
+        """
+        ## The region was jumped over only if the comparisons got past it
+        skipped = stop - start + 1 if 0 <= start <= stop < i else 0
+        self.alignments += 1
+        self.skipped_comparisons += skipped
+        self.comparisons += i - skipped + (1 if i < m else 0)
+
+    def record_shift(self, rule, shift):
+        self.rule_counts[rule] += 1
+        self.shift_histogram[shift] += 1
+
+    def as_dict(self):
+        return {
+            "alignments": self.alignments,
+            "comparisons": self.comparisons,
+            "skipped_comparisons": self.skipped_comparisons,
+            "rule_counts": dict(self.rule_counts),
+            "shift_histogram": dict(sorted(self.shift_histogram.items())),
+        }
+
+    def __repr__(self):
+        return f"SearchStatistics({self.as_dict()})"
+
+
 def calculate_suffix_shift(gp, ms, pat, previous):
     """
     Calculates the shift, start and stop value for the reversed implementation of Boyer-Moore.
@@ -212,75 +473,96 @@ def calculate_suffix_shift(gp, ms, pat, previous):
 
     ## no good prefix exists, use longest suffix to determine shift to maintain
     ## alignment with shorter prefix matches/non-prefix pattern occurences
+    ## the matched prefix pat[0...ms-1] now sits under the suffix pat[m-ms...m-1]
     else:
         shift = m - matched_suffix_length
-        start = 0
-        stop = matched_suffix_length - 1
+        start = m - matched_suffix_length
+        stop = m - 1
     return shift, start, stop
 
 
-def calculate_character_shift(bcm, character, i):
+def calculate_character_shift(bct, character, i, m):
     """
     Determines shift distance for a given character at a specific position based on the
-    bad character matrix. The shift is based on the leftmost occurrence of the mismatched
+    bad character table. The shift is based on the leftmost occurrence of the mismatched
     character to the right of the current position. If no such occurrence exists within
-    the pattern, a default shift of 1 is applied to move the pattern past the mismatched character.
+    the pattern, the pattern is shifted entirely past the mismatched character.
 
     Parameters:
-    - bcm (list of lists): The bad character matrix precomputed for the pattern, where bcm[c][i]
-      represents the leftmost position of character 'c' to the right of index 'i' in the pattern.
+    - bct (dict): The bad character table precomputed for the pattern, where bct[c] holds the
+      sorted positions of character 'c' in the pattern.
     - character (str): The mismatched character encountered in the text.
     - i (int): The current position in the pattern where the mismatch occurred.
+    - m (int): The length of the pattern.
 
     Returns:
     - int: The calculated shift distance based on the bad character rule. This is the difference
       between the leftmost position of the mismatched character to the right of 'i' and 'i' itself,
-      or 1 if the character does not occur to the right.
+      or m - i if the character does not occur to the right.
 
     """
-    ascii_base = ord("!")  ## ASCII value offset for printable characters
-    char_index = ord(character) - ascii_base  ## Calculate index in bcm
+    positions = bct.get(character)
+    if positions is not None:
+        ## Binary search for the first occurrence strictly to the right of i
+        index = bisect_right(positions, i)
+        if index < len(positions):
+            return positions[index] - i
 
-    if bcm[char_index][i] > -1:
-        # Calculate shift based on character's leftmost occurrence to the right of i
-        return bcm[char_index][i] - i
-    else:
-        ## Default shift of 1 when character does not occur to the right or at
-        return 1
+    ## No occurrence to the right, so no alignment placing character in pat[i+1...m-1] can match
+    return m - i
 
 
-def reverse_boyer_moore(txt, pat):
+def reverse_boyer_moore(txt, pat, galil=False, stats=None):
     """
     Implements the Reverse Boyer-Moore search algorithm to identify all instances
     of a pattern within text. The search proceeds right-to-left through the text,
     while pattern shifts are executed left-to-right. Mismatches trigger a
-    comparison between shift distances derived from the good suffix (gs) and bad
-    character (bcm) arrays, adopting the larger to advance the search. In cases
+    comparison between shift distances derived from the good suffix (gs) array and bad
+    character (bct) table, adopting the larger to advance the search. In cases
     of equal shift lengths, gs shifts are favored, utilizing 'start' and 'stop'
     optimization boundaries to prevent redundant comparisons.
 
-    The algorithm uses three arrays for calculating shifting:
+    The algorithm uses three tables for calculating shifting:
     1. gp (Good Prefix): Contains start positions of the leftmost occurrence of substrings followed by a character not matching pat[i+1].
-    2. mp (Match Suffix): Holds lengths of the largest substrings within pat[0...i] that are suffixes of pat
-    3. bcm (Bad Character Matrix): Tracks leftmost positions of characters right of position i
+    2. mp (Match Suffix): Holds lengths of the largest prefixes of pat[0...i] that are suffixes of pat
+    3. bct (Bad Character Table): Sorted positions of each pattern character, searched for the leftmost position right of i
+
+    Matches are produced lazily, so callers that only need a count, the first few matches or an
+    existence check can stop the search early (see count_matches, first_matches and has_match).
+
+    With galil set, the Galil rule is also applied after a full match: the pattern is shifted by its
+    period p = m - mp[m-2], so pat[p...m-1] is already known to match the text and only pat[0...p-1]
+    is compared at the next alignment. Together with the verified regions kept after good prefix and
+    match suffix shifts, this bounds the search to O(n + m) comparisons, even for periodic patterns
+    such as "aaa...a" against "aaa...a".
 
     Parameters:
     - txt (str): Target text for pattern search.
-    - pat (str): Pattern sought within the text.
+    - pat (str or CompiledPattern): Pattern sought within the text. A str is compiled through
+      compile_pattern, so its tables are only constructed the first time it is searched for.
+    - galil (bool): Whether to keep the verified region after a full match (Galil rule).
+    - stats (SearchStatistics): If given, updated with comparison and shift counts as the search runs.
+
+    Yields:
+    - int: The start position of each match in 1-indexing, in the order they are found (right to left).
 
     Time Complexity:
     - Best case: O(n/m), where n is the length of the text and m is the length of the pattern
     - Average and Worst case: O(m*n), when many potential matches or overlaps.
+    - Worst case with galil: O(n + m).
 
     Space Complexity:
-    - O(m*σ), where m is the length of the pattern and σ is the size of the alphabet (printable ASCII range).
-    This space is required for storing the match suffix, good prefix arrays, and the bad character matrix.
+    - O(m), where m is the length of the pattern.
+    This space is required for storing the match suffix, good prefix arrays, and the bad character table.
 
     """
-    mp = construct_match_suffix_array(pat)
+    if not isinstance(pat, CompiledPattern):
+        pat = compile_pattern(pat)
+    mp, gs, bct = pat.mp, pat.gp, pat.bct
+    pat = pat.pat
     m, n = len(pat), len(txt)
-    gs = construct_good_prefix_array(pat)
-    bcm = construct_bad_character_matrix(pat)
+    if m == 0:
+        return
 
     ## Initialise start and stop as -2 to always fail first optimisation condition
     start = stop = -2
@@ -293,10 +575,10 @@ def reverse_boyer_moore(txt, pat):
 
         ## While a mismatch has not been found
         while i < m:
-            ## If we are within the boundary of previous comparison, skip these characters (we previously made an MP or GS shift)
+            ## If we are within the boundary of previous comparison, jump past these characters (we previously made an MP or GS shift)
             if i <= stop and i >= start:
-                i += 1
-                k += 1
+                i = stop + 1
+                k = j + i
 
             ## Else perform the comparison between txt[k] and pat[i]
             elif pat[i] == txt[k]:
@@ -307,18 +589,28 @@ def reverse_boyer_moore(txt, pat):
             else:
                 break
 
-        ## Full match found if i has incremented to equal m. Output this match and shift by mp[1]
+        if stats is not None:
+            stats.record_alignment(i, start, stop, m)
+
+        ## Full match found if i has incremented to equal m. Output this match and shift by mp[m-2]
         if i == m:
-            print((k - m) + 1)  ## Output the start position of this match in 1-indexing
-            j = min((j - 1), (j - (m - mp[1])))  ## Apply the largest shift
-            start = stop = -1  ## Reset optimisation boundaries
+            yield (k - m) + 1  ## Output the start position of this match in 1-indexing
+            j -= m - mp[m - 2]  ## Align the longest proper prefix that is also a suffix
+            if stats is not None:
+                stats.record_shift("full_match", m - mp[m - 2])
+
+            ## Galil rule: the aligned prefix now sits under pat[m-mp[m-2]...m-1], which is known to match
+            if galil:
+                start, stop = m - mp[m - 2], m - 1
+            else:
+                start = stop = -1  ## Reset optimisation boundaries
 
         ## Else we have had a mismatch, txt[k] != pat[i]. Shift accordingly
         else:
 
             ## Calculate both shifts
             gs_shift, gs_start, gs_stop = calculate_suffix_shift(gs, mp, pat, i - 1)
-            bc_shift = calculate_character_shift(bcm, txt[k], i)
+            bc_shift = calculate_character_shift(bct, txt[k], i, m)
 
             ## Determine which shift to use, preferencing good suffix > bad character
             ## if both shifts are equal to leverage optimisation boundaries
@@ -329,12 +621,127 @@ def reverse_boyer_moore(txt, pat):
                 shift = bc_shift
                 start, stop = -1, -1  ## Reset optimisation boundaries
 
+            if stats is not None:
+                if gs_shift < bc_shift:
+                    stats.record_shift("bad_character", shift)
+                elif gs[i - 1] > -1:
+                    stats.record_shift("good_prefix", shift)
+                else:
+                    stats.record_shift("match_suffix", shift)
+
             ## Apply the calculated shift to j
             j -= shift
 
 
+def search_file(file_path, pat, chunk_size=None):
+    """
+    Runs reverse_boyer_moore over the bytes of a file without loading the whole file as one str,
+    so that files larger than memory can be searched.
+
+    By default the file is memory-mapped and searched in place, leaving paging to the operating system.
+    If chunk_size is given, the file is instead read from its end in blocks of chunk_size bytes. Each block
+    is searched together with the first m - 1 bytes of the block to its right, so a match straddling a block
+    boundary is found exactly once, in the block that holds its first byte. At most chunk_size + m - 1 bytes
+    of the file are held in memory at a time.
+
+    Parameters:
+    - file_path (str): The file to search.
+    - pat (str or bytes): Pattern sought within the file. A str is encoded as UTF-8.
+    - chunk_size (int): The number of bytes read per block, or None to memory-map the file.
+
+    Yields:
+    - int: The byte offset of each match in 1-indexing, from right to left, as in reverse_boyer_moore.
+    """
+    if isinstance(pat, str):
+        pat = pat.encode("utf-8")
+    compiled = compile_pattern(pat)
+    m = len(pat)
+
+    with open(file_path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+
+        ## An empty file cannot be mapped, and no file shorter than pat can contain it
+        if size < max(m, 1):
+            return
+
+        if chunk_size is None:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                yield from reverse_boyer_moore(buffer, compiled)
+            return
+
+        block_end = size  ## File offset one past the last byte not yet searched
+        overlap = b""  ## First m - 1 bytes of the previously searched block
+
+        while block_end > 0:
+            block_start = max(0, block_end - chunk_size)
+            file.seek(block_start)
+            block = file.read(block_end - block_start) + overlap
+
+            ## Offsets within the block are relative to block_start
+            for position in reverse_boyer_moore(block, compiled):
+                yield block_start + position
+
+            overlap = block[: m - 1]
+            block_end = block_start
+
+
+def count_matches(txt, pat):
+    """
+    Counts the occurrences of pat in txt without materialising the matches.
+
+    Returns:
+    - int: The number of matches.
+    """
+    return sum(1 for _ in reverse_boyer_moore(txt, pat))
+
+
+def first_matches(txt, pat, k):
+    """
+    Returns the first k matches found by reverse_boyer_moore, stopping the search as soon as
+    k matches have been found. As the search runs right to left, these are the k rightmost matches.
+
+    Returns:
+    - list: Up to k start positions in 1-indexing, in descending order.
+    """
+    return list(islice(reverse_boyer_moore(txt, pat), k))
+
+
+def has_match(txt, pat):
+    """
+    Checks whether pat occurs in txt, stopping the search at the first match.
+
+    Returns:
+    - bool: True if at least one match exists, otherwise False.
+    """
+    return next(reverse_boyer_moore(txt, pat), None) is not None
+
+
+def write_matches(matches, file=None, batch_size=4096):
+    """
+    Writes match positions one per line, joining them into batches of batch_size lines so
+    that output costs one write call per batch rather than one per match.
+
+    Parameters:
+    - matches (iterable of int): The match positions to write.
+    - file (file object): The text stream to write to. Defaults to sys.stdout at the time of the call, so
+      redirect_stdout and output capture see it.
+    - batch_size (int): The number of lines buffered before each write.
+    """
+    if file is None:
+        file = sys.stdout
+
+    batch = []
+    for position in matches:
+        batch.append(f"{position}\n")
+        if len(batch) == batch_size:
+            file.write("".join(batch))
+            batch.clear()
+    if batch:
+        file.write("".join(batch))
+
+
 if __name__ == "__main__":
     _, filename1, filename2 = sys.argv
     txt = read_file(filename1)
     pat = read_file(filename2)
-    reverse_boyer_moore(txt, pat)
+    write_matches(reverse_boyer_moore(txt, pat))
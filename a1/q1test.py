@@ -0,0 +1,48 @@
+import random
+
+from a1.q1.q1 import reverse_boyer_moore
+
+"""
+Compares reverse_boyer_moore, with and without the Galil rule, against a naive slice scan on seeded random
+texts and patterns. Small alphabets make periodic patterns and overlapping matches common, which is where the
+match suffix array, the full-match shift and the skip regions have gone wrong before.
+
+Usage: python -m a1.q1test
+"""
+
+
+def naive_match(txt, pat):
+    """Start positions of pat in txt in 1-indexing, from right to left like reverse_boyer_moore."""
+    m = len(pat)
+    if m == 0:
+        return []
+    return [i + 1 for i in range(len(txt) - m, -1, -1) if txt[i : i + m] == pat]
+
+
+rng = random.Random(3155)
+count = 0
+total_run = 0
+smallest_fail = None
+
+for alphabet in ("ab", "abc", "acgt"):
+    for _ in range(1000):
+        txt = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 60)))
+        pat = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 8)))
+        if txt and rng.random() < 0.5:
+            ## Cut the pattern from the text so that it occurs at least once
+            start = rng.randrange(len(txt))
+            pat = txt[start : start + rng.randint(1, 8)]
+
+        expected = naive_match(txt, pat)
+        for galil in (False, True):
+            total_run += 1
+            got = list(reverse_boyer_moore(txt, pat, galil=galil))
+            if got == expected:
+                count += 1
+            elif smallest_fail is None or len(txt) + len(pat) < len(smallest_fail[0]) + len(smallest_fail[1]):
+                smallest_fail = (txt, pat)
+                print(f"Failed test: txt={txt!r} pat={pat!r} galil={galil}")
+                print("Expected:", expected)
+                print("Got:", got)
+
+print("Accuracy:", count / total_run * 100, "%")
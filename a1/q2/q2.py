@@ -1,4 +1,3 @@
-from bitarray import bitarray
 import sys
 
 """
@@ -11,9 +10,18 @@ Student ID: 33109109
 ###### q2 File Structure #####
 Terminal Usage Functions
 - read_file (written by Arun, I take no ownership of this function)
+- read_chunks
 
-Main Algorithm Function
+Construction Functions
+- construct_mismatch_masks
+- construct_packed_masks
+
+Main Algorithm Functions
 - bitvector_match
+- stream_bitvector_match
+- stream_approximate_match
+- multi_bitvector_match
+- stream_multi_bitvector_match
 """
 
 
@@ -22,78 +30,309 @@ def read_file(file_path: str) -> str:
         return file.read()
 
 
-def bitvector_match(txt, pat):
+def read_chunks(file, chunk_size=1 << 16):
+    """
+    Yields successive chunks of up to chunk_size characters from an open file object, such as
+    sys.stdin, until it is exhausted.
+    """
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def construct_mismatch_masks(pat):
+    """
+    Constructs the mismatch mask of every character in the pattern, such that bit i of masks[c] is 1
+    if pat[i] != c and 0 if pat[i] == c. Characters that do not occur in the pattern mismatch every
+    position, so they have no entry and take the all ones mask.
+
+    Parameters:
+    - pat (str): The pattern for which the masks are constructed.
+
+    Returns:
+    - masks (dict): Maps each distinct character of pat to its mismatch mask, as a Python int of m bits.
+    """
+    m = len(pat)
+    full = (1 << m) - 1
+    masks = {}
+    for i in range(m):
+        ## clear bit i in the mask of pat[i], starting from all ones
+        masks[pat[i]] = masks.get(pat[i], full) & ~(1 << i)
+    return masks
+
+
+def construct_packed_masks(patterns):
+    """
+    Packs the mismatch masks of many patterns into one wide mask per character. Pattern p is given its
+    own lane of m_p + 1 bits: bits 0...m_p-1 of the lane hold its mismatch mask, as in construct_mismatch_masks,
+    and the top bit is a guard that is kept 0, so that shifting the packed bit vector left moves a 0 into
+    bit 0 of the next lane instead of the top bit of this one. Empty patterns are given no lane.
+
+    Parameters:
+    - patterns (list of str): The patterns for which the masks are constructed.
+
+    Returns:
+    - tuple: (masks, keep, lanes), where
+      - masks (dict) maps each character occurring in any pattern to its packed mismatch mask,
+      - keep (int) has every pattern bit set and every guard bit clear, which is also the packed mask
+        of a character that occurs in no pattern,
+      - lanes (dict) maps the bit index of the last pattern bit of each lane to (pattern_id, m_p).
+    """
+    ## Lay out the lanes, so that every pattern bit is known before any mask is built
+    keep = 0
+    lanes = {}
+    bases = {}
+    base = 0
+    for pattern_id, pat in enumerate(patterns):
+        m = len(pat)
+        if m == 0:
+            continue
+        keep |= ((1 << m) - 1) << base
+        lanes[base + m - 1] = (pattern_id, m)
+        bases[pattern_id] = base
+        base += m + 1
+
+    ## Every character starts by mismatching every lane, then each pattern writes its own lane
+    masks = {}
+    for pattern_id, base in bases.items():
+        pat = patterns[pattern_id]
+        lane = ((1 << len(pat)) - 1) << base
+        for character, mask in construct_mismatch_masks(pat).items():
+            masks[character] = (masks.get(character, keep) & ~lane) | (mask << base)
+
+    return masks, keep, lanes
+
+
+def bitvector_match(txt, pat, k=0, edits=False):
     """
     Implements pattern matching utilizing bit vectors. This approach identifies all occurrences
     of a pattern within a text by updating bit vectors to track matching positions as the
     pattern is shifted from left to right under the text.
 
     The bit vector update mechanism uses the relationship between the bit vectors of
-    successive text positions. Bit vector delta_j is generated for each text
-    position j, indicating mismatches between txt[j] and each character in pat. The
-    bit vector for j, bitvector_j, is then obtained by left-shifting the previous bit vector
-    and performing a logical or with delta_j.
+    successive text positions. The bit vector for j, bitvector_j, is obtained by shifting the
+    previous bit vector left by one and performing a logical or with delta_j, the mismatch mask
+    of txt[j] (see construct_mismatch_masks). The masks are computed once per pattern character,
+    and each bit vector is a single Python int, so every text position costs one shift, one or
+    and one and, however long the pattern is.
+
+    Bit i of bitvector_j is 1 to indicate a mismatch for the prefix pat[0...i] against txt[j-i...j],
+    otherwise 0 for a match. Full matches are identified where bit m-1 of bitvector_j is 0, indicating
+    a complete prefix match. Only the previous bit vector is ever needed, so it is the only one kept.
 
-    The matrix r holds bit vectors for each text position, where r[i] represents the
-    bitvector corresponding to prefix matches of pat at position txt[i]. A value of r[i][j] = 1
-    indicates a mismatch for the prefix pat[0...i] against txt[j-i...j], otherwise 0 for a match.
-    (Please note that I indexed the bitvector in reverse to what is in the spec sheet)
-    Full matches are identified where r[i][0] = 0 for any i, indicating a complete prefix match.
+    With k > 0, or with edits, occurrences within distance k of pat are reported instead (see
+    stream_approximate_match). Edit matches are always given by end position, so k = 0 with edits gives the
+    exact matches in the same coordinates as a larger k.
 
     Parameters:
     - txt (str): The text in which to search for the pattern.
     - pat (str): The pattern to search for within the text.
+    - k (int): The maximum number of mismatches (or edits) allowed in a match.
+    - edits (bool): Whether k bounds the Levenshtein distance rather than the Hamming distance.
+
+    Yields:
+    - int: The start position of each match in 1-indexing, from left to right. For edits, where a match
+      need not be m characters long, the end position of each match in 1-indexing is given instead.
+
+    Time Complexity: O(n + m) big integer operations, where m is the length of the pattern and n is the
+    length of the text. Each operation acts on m bits, so for m beyond the machine word size it costs
+    O(m/w) machine words.
+
+    Space Complexity: O(m), for the masks of the distinct pattern characters and the current bit vector.
+    """
+    ## No matches if text is shorter than pattern, unless characters of the pattern may be deleted
+    if len(txt) < len(pat) and not edits:
+        return
+
+    yield from stream_bitvector_match((txt,), pat, k, edits)
+
+
+def stream_bitvector_match(chunks, pat, k=0, edits=False):
+    """
+    Runs the bitvector_match update over text that arrives as a sequence of chunks, such as the
+    output of read_chunks or the lines of a file, and reports matches as soon as they are found.
+    The bit vector carries over between chunks, so matches that span chunk boundaries are found,
+    and no text is kept once it has been processed. This makes it suitable for unbounded log
+    streams and stdin pipes.
+
+    Parameters:
+    - chunks (iterable of str): The text to search, in order.
+    - pat (str): The pattern to search for within the text.
+    - k (int): The maximum number of mismatches (or edits) allowed in a match.
+    - edits (bool): Whether k bounds the Levenshtein distance rather than the Hamming distance.
+
+    Yields:
+    - int: The start position of each match in 1-indexing, relative to the start of the stream
+      (the end position for edits, as in bitvector_match).
+
+    Time Complexity: O(n + m) big integer operations, as in bitvector_match.
+
+    Space Complexity: O(m) in addition to the chunk being processed.
+    """
+    m = len(pat)
+    if m == 0:
+        return
+
+    ## Edit matches are reported by end position, so they take the approximate path even for k = 0
+    if k > 0 or edits:
+        yield from stream_approximate_match(chunks, pat, k, edits)
+        return
+
+    masks = construct_mismatch_masks(pat)
+    full = (1 << m) - 1  ## mask of a character not in pat, also used to truncate to m bits
+    found = 1 << (m - 1)  ## bit m-1, 0 when the full pattern matches
+
+    ## No prefix has matched before the start of the stream
+    bitvector = full
+    offset = -m + 2  ## added to a 0-indexed end position to give a 1-indexed start position
+
+    for chunk in chunks:
+        ## Shift pat under text from left to right
+        for j, character in enumerate(chunk, offset):
+            bitvector = ((bitvector << 1) | masks.get(character, full)) & full
+
+            # If bit m-1 is 0, then the full pattern matched the m characters ending here
+            if not bitvector & found:
+                yield j
+
+        offset += len(chunk)
+
+
+def stream_approximate_match(chunks, pat, k, edits=False):
+    """
+    Extends the bitvector_match update to report every occurrence of pat within distance k, using the
+    Wu-Manber formulation. k + 1 bit vectors are kept, where bit i of bitvector d is 0 if the prefix
+    pat[0...i] matches the text ending at the current character with at most d errors. On each character:
+
+    - bitvector 0 is updated exactly as in bitvector_match.
+    - bitvector d > 0 is 0 at bit i if pat[i] matches the character and bitvector d was 0 at bit i-1, or
+      if bitvector d-1 was 0 at bit i-1 (substituting pat[i]). With edits, bit i may also come from the
+      new bitvector d-1 at bit i-1 (deleting pat[i]) or the old bitvector d-1 at bit i (inserting the
+      character). Under the mismatch-bit convention each alternative is an and of shifted vectors.
+
+    Parameters:
+    - chunks (iterable of str): The text to search, in order.
+    - pat (str): The pattern to search for within the text.
+    - k (int): The maximum number of mismatches (or edits) allowed in a match.
+    - edits (bool): Whether k bounds the Levenshtein distance rather than the Hamming distance.
+
+    Yields:
+    - int: The start position of each match in 1-indexing for Hamming distance, or the end position
+      of each match in 1-indexing for edits, relative to the start of the stream.
 
-    Time Complexity: O(mn), where m is the length of the pattern and n is the length of the text.
-    Due to iterating through all of n without skips, and comparing each new character at txt[j], m<=j<n
-    to each character in pat
+    Time Complexity: O(k(n + m)) big integer operations.
 
-    Space Complexity: O(m + n), due to dimensions of r.
+    Space Complexity: O(k + m) in addition to the chunk being processed.
     """
-    n = len(txt)
     m = len(pat)
+    masks = construct_mismatch_masks(pat)
+    full = (1 << m) - 1  ## mask of a character not in pat, also used to truncate to m bits
+    found = 1 << (m - 1)  ## bit m-1, 0 when the full pattern matches
 
-    ## Return empty if text is shorter than pattern
-    if n < m:
-        return []
+    ## Before the stream starts, only prefixes of up to d characters can match, by deleting them
+    if edits:
+        bitvectors = [(full << d) & full for d in range(k + 1)]
+        offset = 1  ## added to a 0-indexed end position to give a 1-indexed end position
+    else:
+        bitvectors = [full for d in range(k + 1)]
+        offset = -m + 2  ## added to a 0-indexed end position to give a 1-indexed start position
 
-    ## Initialise r as a matrix of None
-    r = [None for i in range(n)]
+    for chunk in chunks:
+        for j, character in enumerate(chunk, offset):
+            mask = masks.get(character, full)
+            previous = bitvectors[0]  ## bitvector d-1 before this character
+            bitvectors[0] = ((previous << 1) | mask) & full
 
-    ## Construct initial bit vector by direct comparison
-    first_bit = [1 if pat[0:i] != txt[m - i : m] else 0 for i in range(m, 0, -1)]
-    first_bit = bitarray(first_bit)
+            for d in range(1, k + 1):
+                current = bitvectors[d]
+                bitvector = ((current << 1) | mask) & (previous << 1)
+                if edits:
+                    bitvector &= (bitvectors[d - 1] << 1) & previous
+                bitvectors[d] = bitvector & full
+                previous = current
 
-    # Check if a pattern match exists starting at first position
-    if first_bit[0] == 0:
-        print(1)  ## 1-indexing
+            # If bit m-1 of bitvector k is 0, then pat matched the text ending here with at most k errors
+            if not bitvectors[k] & found:
+                yield j
 
-    r[m - 1] = first_bit
+        offset += len(chunk)
 
-    ## Shift pat under text from left to right
-    ## Start at m as a full pattern match cannot fit in txt[0...(<m)]
-    for j in range(m, n):
-        previous = r[j - 1]
-        delta = bitarray(m)
 
-        ## Populate delta with mismatches between pat and txt[j]
-        for i in range(m):
-            delta[i] = pat[m - i - 1] != txt[j]
+def multi_bitvector_match(txt, patterns):
+    """
+    Finds all occurrences of every pattern in patterns in one pass over txt (see stream_multi_bitvector_match).
 
-        ## Shift previous bit vector left and combine with delta
-        shift_left = previous[1:] + bitarray("0")
-        bitvector_j = shift_left | delta
+    Parameters:
+    - txt (str): The text in which to search for the patterns.
+    - patterns (list of str): The patterns to search for within the text.
 
-        r[j] = bitvector_j
+    Yields:
+    - tuple: (pattern_id, position) for each match, where pattern_id indexes patterns and position is the
+      start position of the match in 1-indexing, ordered by the end of the match.
+    """
+    yield from stream_multi_bitvector_match((txt,), patterns)
 
-        # If the current bitvector[0] is 0, then the prefix[0...(m-0)] or the full pattern matched
-        # the txt at txt[j-m+1...j]
-        if bitvector_j[0] == 0:
-            print(j - m + 2)  ## 1 -indexing
+
+def stream_multi_bitvector_match(chunks, patterns):
+    """
+    Runs the bitvector_match update for many patterns at once. The bit vectors of all patterns are packed
+    into one Python int, one lane per pattern (see construct_packed_masks), so each text character costs one
+    shift, one or and one and on the packed int, however many patterns there are. A match shows up as a 0
+    in the last pattern bit of a lane, and all such bits are tested together with a single and.
+
+    Parameters:
+    - chunks (iterable of str): The text to search, in order.
+    - patterns (list of str): The patterns to search for within the text.
+
+    Yields:
+    - tuple: (pattern_id, position) for each match, where pattern_id indexes patterns and position is the
+      start position of the match in 1-indexing relative to the start of the stream.
+
+    Time Complexity: O(n + M) big integer operations, plus O(1) per match, where M is the total length of
+    the patterns. Each operation acts on M + p bits for p patterns.
+
+    Space Complexity: O(M) for the packed masks of the distinct pattern characters and the bit vector.
+    """
+    masks, keep, lanes = construct_packed_masks(patterns)
+    if not lanes:
+        return
+
+    ## The last pattern bit of every lane, all 1 unless some pattern has just matched
+    tops = 0
+    for top in lanes:
+        tops |= 1 << top
+
+    ## No prefix has matched before the start of the stream
+    bitvector = keep
+    offset = 1  ## added to a 0-indexed end position to give a 1-indexed end position
+
+    for chunk in chunks:
+        for j, character in enumerate(chunk, offset):
+            bitvector = ((bitvector << 1) | masks.get(character, keep)) & keep
+
+            if bitvector & tops != tops:
+                ## Visit each lane whose last pattern bit is 0, in pattern order
+                matched = tops & ~bitvector
+                while matched:
+                    lowest = matched & -matched
+                    pattern_id, m = lanes[lowest.bit_length() - 1]
+                    yield pattern_id, j - m + 1
+                    matched ^= lowest
+
+        offset += len(chunk)
 
 
 if __name__ == "__main__":
     _, filename1, filename2 = sys.argv
-    txt = read_file(filename1)
     pat = read_file(filename2)
-    bitvector_match(txt, pat)
+
+    ## Stream the text so that it never has to fit in memory, reading stdin if filename1 is "-"
+    if filename1 == "-":
+        matches = stream_bitvector_match(read_chunks(sys.stdin), pat)
+        sys.stdout.writelines(f"{position}\n" for position in matches)
+    else:
+        with open(filename1, "r", encoding="utf-8") as file:
+            matches = stream_bitvector_match(read_chunks(file), pat)
+            sys.stdout.writelines(f"{position}\n" for position in matches)
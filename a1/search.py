@@ -0,0 +1,193 @@
+import json
+import os
+import sys
+from functools import lru_cache
+
+from a1.benchmark import ENGINES, run_benchmarks
+from a1.q1.q1 import calculate_z_array, read_file, write_matches
+
+"""
+###### search File Structure #####
+Pattern Statistics
+- smallest_period
+
+Threshold Functions
+- mean_throughput
+- calibrate
+- load_thresholds
+
+Main Functions
+- choose_engine
+- search
+
+Terminal Usage
+- python -m a1.search txt_file pat_file    (writes the match positions, one per line)
+- python -m a1.search --calibrate          (benchmarks this machine and saves the thresholds)
+
+search is the front door over the a1 engines. It picks reverse Boyer-Moore when the pattern is long enough for
+its shifts to pay off, and a linear left-to-right scan otherwise. The thresholds come from THRESHOLDS_PATH when
+calibrate has been run on this machine, and from DEFAULT_THRESHOLDS otherwise.
+"""
+
+THRESHOLDS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "engine_thresholds.json")
+SMALL_ALPHABET = 4  ## patterns with at most this many distinct characters use the "small" alphabet thresholds
+
+DEFAULT_THRESHOLDS = {
+    "min_text_size": 1024,  ## below this, preprocessing dominates and the linear engine is used
+    "boyer_moore_min_length": {"small": 64, "large": 8},
+    "linear_engine": "kmp_match",
+    "periodic_engine": "kmp_match",
+}
+
+CALIBRATION_SIZE = 200000
+CALIBRATION_LENGTHS = [2, 4, 8, 16, 32, 64, 128, 256]
+LINEAR_ENGINES = ["bitvector_match", "z_match", "kmp_match"]
+PERIODIC_ENGINES = LINEAR_ENGINES + ["reverse_boyer_moore_galil"]
+
+
+def smallest_period(pat):
+    """
+    Returns the smallest period p of pat, such that pat[i] == pat[i + p] for every valid i, from its Z-array:
+    p is the first position whose Z-box reaches the end of the pattern, or m if there is none.
+    """
+    m = len(pat)
+    zp = calculate_z_array(pat)
+    for p in range(1, m):
+        if p + zp[p] == m:
+            return p
+    return m
+
+
+def mean_throughput(results, engine, alphabets, length=None):
+    """Returns the mean MB/s of engine over the benchmark records for alphabets (and length, if given)."""
+    rates = [
+        record["mb_per_s"]
+        for record in results
+        if record["engine"] == engine
+        and record["alphabet"] in alphabets
+        and (length is None or record["pattern_length"] == length)
+    ]
+    return sum(rates) / len(rates)
+
+
+def calibrate(path=THRESHOLDS_PATH, size=CALIBRATION_SIZE, lengths=CALIBRATION_LENGTHS):
+    """
+    Benchmarks the engines on this machine and saves the dispatch thresholds to path as JSON.
+
+    - linear_engine is the fastest of LINEAR_ENGINES over DNA and English text.
+    - periodic_engine is the fastest of PERIODIC_ENGINES on periodic text.
+    - boyer_moore_min_length is, for DNA ("small") and English ("large"), the shortest pattern length from
+      which reverse_boyer_moore beats linear_engine at every longer length measured, or None if it never does.
+    - min_text_size is kept from DEFAULT_THRESHOLDS.
+
+    Returns:
+    - dict: The thresholds that were saved.
+    """
+    engines = ["reverse_boyer_moore"] + PERIODIC_ENGINES
+    results = run_benchmarks(["dna", "english", "periodic"], [size], lengths, engines, memory=False)
+
+    linear_engine = max(
+        LINEAR_ENGINES, key=lambda engine: mean_throughput(results, engine, ["dna", "english"])
+    )
+    periodic_engine = max(
+        PERIODIC_ENGINES, key=lambda engine: mean_throughput(results, engine, ["periodic"])
+    )
+
+    boyer_moore_min_length = {}
+    for alphabet_class, alphabet in (("small", "dna"), ("large", "english")):
+        ## Walk down from the longest length while reverse Boyer-Moore keeps winning
+        boyer_moore_min_length[alphabet_class] = None
+        for length in sorted(lengths, reverse=True):
+            boyer_moore = mean_throughput(results, "reverse_boyer_moore", [alphabet], length)
+            if boyer_moore <= mean_throughput(results, linear_engine, [alphabet], length):
+                break
+            boyer_moore_min_length[alphabet_class] = length
+
+    thresholds = {
+        "min_text_size": DEFAULT_THRESHOLDS["min_text_size"],
+        "boyer_moore_min_length": boyer_moore_min_length,
+        "linear_engine": linear_engine,
+        "periodic_engine": periodic_engine,
+    }
+    with open(path, "w") as file:
+        json.dump(thresholds, file, indent=2)
+    load_thresholds.cache_clear()
+    return thresholds
+
+
+@lru_cache(maxsize=None)
+def load_thresholds(path=THRESHOLDS_PATH):
+    """
+    Returns the thresholds saved by calibrate at path, or DEFAULT_THRESHOLDS if this machine has not been
+    calibrated. The file is read once per path.
+    """
+    if not os.path.exists(path):
+        return DEFAULT_THRESHOLDS
+    with open(path, "r") as file:
+        return json.load(file)
+
+
+def choose_engine(txt, pat, thresholds=None):
+    """
+    Picks the engine expected to be fastest for searching txt for pat.
+
+    1. Short texts use the linear engine, as there is too little text for any shifts to repay preprocessing.
+    2. Periodic patterns (smallest period at most m/2) use the periodic engine, as they drive reverse
+       Boyer-Moore towards O(mn) comparisons.
+    3. Patterns at least boyer_moore_min_length long for their alphabet size use reverse Boyer-Moore, whose
+       average shift grows with m.
+    4. Everything else uses the linear engine.
+
+    Parameters:
+    - txt (str): Target text for pattern search.
+    - pat (str): Pattern sought within the text.
+    - thresholds (dict): Dispatch thresholds, by default those of load_thresholds.
+
+    Returns:
+    - str: A key of ENGINES.
+    """
+    thresholds = thresholds or load_thresholds()
+    m, n = len(pat), len(txt)
+
+    if n < thresholds["min_text_size"]:
+        return thresholds["linear_engine"]
+
+    if 2 * smallest_period(pat) <= m:
+        return thresholds["periodic_engine"]
+
+    alphabet_class = "small" if len(set(pat)) <= SMALL_ALPHABET else "large"
+    min_length = thresholds["boyer_moore_min_length"][alphabet_class]
+    if min_length is not None and m >= min_length:
+        return "reverse_boyer_moore"
+
+    return thresholds["linear_engine"]
+
+
+def search(txt, pat, thresholds=None):
+    """
+    Finds all occurrences of pat in txt with the engine chosen by choose_engine.
+
+    Returns:
+    - list: The start position of each match in 1-indexing, in increasing order whichever engine ran.
+    """
+    if len(pat) == 0 or len(txt) < len(pat):
+        return []
+
+    engine = choose_engine(txt, pat, thresholds)
+    matches = list(ENGINES[engine](txt, pat))
+
+    ## reverse Boyer-Moore reports matches from right to left
+    if engine.startswith("reverse_boyer_moore"):
+        matches.reverse()
+    return matches
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["--calibrate"]:
+        json.dump(calibrate(), sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        _, filename1, filename2 = sys.argv
+        txt = read_file(filename1)
+        pat = read_file(filename2)
+        write_matches(search(txt, pat))
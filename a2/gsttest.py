@@ -0,0 +1,50 @@
+import os
+import random
+import tempfile
+import time
+
+from a2.q1.q1 import GeneralizedSuffixTree
+
+"""
+Times GeneralizedSuffixTree on a growing number of short documents. Construction and
+longest_common_substring are linear in the total length, so doubling the number of documents should roughly
+double both times. A ratio near 4 means something has become quadratic in the number of documents, such as
+a linear scan over the children of the root, which holds one terminator edge per document.
+
+Usage: python -m a2.gsttest
+"""
+
+DOCUMENT_LENGTH = 20
+DOCUMENT_COUNTS = [1000, 2000, 4000]
+MAX_RATIO = 3  ## allowed growth in time per doubling, between linear (2) and quadratic (4)
+
+rng = random.Random(3155)
+previous = None
+failed = False
+
+with tempfile.TemporaryDirectory() as directory:
+    for d in DOCUMENT_COUNTS:
+        fileNames = []
+        for documentID in range(d):
+            fileName = os.path.join(directory, f"{documentID}.txt")
+            with open(fileName, "w") as file:
+                file.write("".join(rng.choice("abcdefghij") for _ in range(DOCUMENT_LENGTH)))
+            fileNames.append(fileName)
+
+        start = time.perf_counter()
+        tree = GeneralizedSuffixTree(fileNames)
+        tree.build_suffix_tree()
+        tree.longest_common_substring(2)
+        seconds = time.perf_counter() - start
+
+        if previous is None:
+            print(f"{d} documents: {seconds:.2f} s")
+        else:
+            ratio = seconds / previous
+            print(f"{d} documents: {seconds:.2f} s ({ratio:.1f}x)")
+            if ratio > MAX_RATIO:
+                failed = True
+                print(f"Failed: doubling the documents multiplied the time by more than {MAX_RATIO}")
+        previous = seconds
+
+print("Failed" if failed else "Passed")
@@ -1,6 +1,14 @@
-from collections import defaultdict
+from array import array
+from bisect import bisect_right
+from collections import Counter, defaultdict, deque
+import hashlib
+import mmap
+import os
+import struct
 import sys
 
+import numpy as np
+
 """
 CHLOE KOE 
 33109109
@@ -18,8 +26,8 @@ Part 1: Suffix Tree Construction
 2. Depth-First Search (DFS) in Lexicographic Order
     - A DFS is performed on the suffix tree in lexicographic order. Each node processes its children based on their 
       lexicographical order, and since the maximum number of children a node can have is limited by the size of the ASCII character set,
-      the sorting operation is effectively constant time. Note that for the construction of the tree, a hash map is used to 
-      access children in constant time, the sorted children array is only constructed and used in the DFS.
+      the sorting operation is effectively constant time. Note that for the construction of the tree, a hash map keyed
+      by code point is used to access children in constant time, the sorted children are only produced in the DFS.
     - The DFS terminates early if all requested positions have been found, optimizing the traversal process.
 
 Part 2: Extension for Encoding (Question 2)
@@ -34,83 +42,74 @@ This mode adds specific operations that are performed concurrently with the suff
 2. Burrows-Wheeler Transform Construction:
     - As the DFS visits each suffix `i`, the Burrows-Wheeler Transform is constructed by appending `string[(i-1) % n]` to the BWT array. 
     This operation is integrated into the DFS to eliminate the need for a separate pass over the data.
-"""
 
+Part 3: Suffix Array Backend
 
-class Edge:
-    """
-    Represents an edge in a Suffix Tree, which is a substring or a portion of the input string.
+SuffixArray is a drop-in sibling of SuffixTree for ranking and the BWT, which only need the leaf order of the
+tree. It sorts the suffixes directly by prefix doubling over NumPy arrays and keeps the result as a flat
+array('i'), so it never allocates the O(n) nodes of the tree.
 
-    Attributes:
-        head (Node): The starting node of the edge.
-        tail (Node): The ending node of the edge.
-        start (int): The starting index in the string for this edge's label.
-        end (int): The ending index in the string for this edge's label, can be -1 indicating current position.
-        value (any): Additional value that can be used to store any specific data related to the edge.
-
-    Methods:
-        full_value: Retrieves the full string value represented by this edge.
-        length: Calculates the length of the substring represented by this edge.
-    """
+Part 4: Persistent Suffix Index
 
-    def __init__(self, head, tail, start, end, value):
-        self.head = head
-        self.tail = tail
-        self.start = start
-        self.end = end
-        self.value = value
+A built suffix array and its inverse can be saved to a versioned binary file named after the SHA-256 of the
+text. load_suffix_index reuses that file when it exists and memory-maps it, so a new batch of positions against
+the same text costs one hash of the text and O(1) per rank instead of a full construction.
 
-    def full_value(self, string, global_end):
-        if self.end == -1:
-            return string[self.start : global_end + 1]
-        else:
-            return string[self.start : self.end + 1]
+Part 5: LCP Analytics
 
-    def length(self, global_end):
-        return (global_end if self.end == -1 else self.end) - self.start + 1
+With lcpMode, the lexicographic DFS (or SuffixArray, by Kasai's algorithm) also produces the suffix array and
+the LCP array. LCEIndex answers longest common extension queries between any two suffixes in O(1) with a sparse
+table over the LCP array, and longest_repeated_substring reads the longest repeat off its maximum.
 
-    def __repr__(self):
-        return f"{self.value}|{self.start}:{self.end}"
+Part 6: Generalized Suffix Tree
 
+GeneralizedSuffixTree builds one tree over several documents, each followed by its own terminator, and tags
+every leaf with the document and offset its suffix starts at. It lists the documents that contain a pattern,
+and finds the longest substring common to k documents from the LCP array of its DFS.
 
-class Node:
-    """
-    Represents a node in a Suffix Tree.
+Terminal Usage
+- python q1.py string_file positions_file            (builds the tree and writes the ranks to output_q1.txt)
+- python q1.py string_file positions_file --index    (same output, via the persistent suffix index)
+"""
 
-    Attributes:
-        id (int): Identifier for the node.
-        link_to (Node): Suffix link to another node.
-        edges (dict): Dictionary of edges emanating from the node.
-        sorted_edges (list): Cached list of edges sorted based on some criteria, used for traversal.
-        suffixID (int): Identifier for a suffix starting at this node.
-
-    Methods:
-        __repr__: Returns a string representation of the node.
-    """
+INDEX_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "index")
+INDEX_MAGIC = b"SFXI"
+INDEX_VERSION = 1
+## magic, version, SHA-256 of the UTF-8 text, n; followed by SA and ISA as n little-endian int32 each
+INDEX_HEADER = struct.Struct("<4sI32sQ")
 
-    def __init__(self, link_to=None, ID=None, suffixID=None):
-        self.id = ID
-        self.link_to = link_to
-        self.edges = {}
-        self.sorted_edges = None
-        self.suffixID = suffixID
+## Document terminators come from the Unicode private use area, which is kept out of the documents themselves
+TERMINATOR_BASE = 0xE000
+MAX_DOCUMENTS = 0xF8FF - TERMINATOR_BASE + 1
 
-    def __repr__(self):
-        return f"Node {self.id}"
+
+ROOT = 0  ## node ID of the root
+NONE = -1  ## marks a missing child, or the suffix ID of an internal node
+GLOBAL_END = -1  ## edge end of a leaf, which always extends to the current end of the text
 
 
 class SuffixTree:
     """
     Suffix tree implementation
-    """
 
-    def get_node_id(self):
-        self.node_id += 1
-        return self.node_id
+    Nodes are integer IDs, and every node field lives in a parallel array('i') column indexed by node ID, so a
+    node costs four machine ints rather than a Python object, its __dict__ and its edge objects. Each node except
+    the root has exactly one incoming edge, so the edge label [edge_start...edge_end] is stored on the node it
+    leads to. Internal nodes map the code point of the first character of each outgoing edge to the child it
+    leads to, so a child is found in O(1) whatever the size of the alphabet; leaves have no map at all.
+
+    Columns:
+        link (array('i')): Suffix link of each node.
+        suffix_id (array('i')): Suffix starting at each leaf, or NONE for internal nodes.
+        edge_start (array('i')): Start index in the text of the label of the edge into each node.
+        edge_end (array('i')): End index of that label, or GLOBAL_END for leaves.
+        children (list): Dict from first character code to child ID for internal nodes, or None for leaves.
+    """
 
-    def __init__(self, stringFileName, positionsFileName, encoderMode=False):
+    def __init__(self, stringFileName, positionsFileName, encoderMode=False, lcpMode=False):
         self.text = read_file(stringFileName)
         self.encoderMode = encoderMode
+        self.lcpMode = lcpMode
 
         # Encoder mode specifics
         if self.encoderMode:
@@ -125,9 +124,21 @@ class SuffixTree:
                 for position in read_positions(positionsFileName)
             }
 
-        self.node_id = -1
-        self.root = Node(ID=self.get_node_id())
-        self.root.link_to = self.root
+        self._initialise_tree()
+
+    def _initialise_tree(self):
+        """
+        Sets up an empty tree over self.text, with the root as the active node.
+        """
+        ## node columns, indexed by node ID
+        self.link = array("i")
+        self.suffix_id = array("i")
+        self.edge_start = array("i")
+        self.edge_end = array("i")
+        self.children = []
+
+        self.root = self._new_node(start=0, end=GLOBAL_END)
+        self.children[self.root] = {}
 
         # for representing the active point
         self.aNode = self.root
@@ -143,6 +154,54 @@ class SuffixTree:
 
         self.last_internal_node = None
 
+        ## number of leaves below each node, filled in on the first count
+        self.leaf_count = None
+
+        ## In lcpMode, the DFS records every leaf in order along with the LCP of it and the previous leaf
+        self.suffix_array = array("i")
+        self.lcp = array("i")
+
+    def _new_node(self, start, end, suffixID=NONE):
+        """
+        Appends a node whose incoming edge is labelled text[start...end] and returns its ID. New nodes link to
+        the root until a suffix link is resolved for them.
+        """
+        self.link.append(ROOT)
+        self.suffix_id.append(suffixID)
+        self.edge_start.append(start)
+        self.edge_end.append(end)
+        self.children.append(None)
+        return len(self.link) - 1
+
+    def _edge_length(self, node):
+        end = self.end if self.edge_end[node] == GLOBAL_END else self.edge_end[node]
+        return end - self.edge_start[node] + 1
+
+    def _child(self, node, character):
+        """
+        Returns the child of node whose edge label starts with character, or NONE.
+        """
+        children = self.children[node]
+        if children is None:
+            return NONE
+        return children.get(ord(character), NONE)
+
+    def _add_child(self, node, child):
+        """
+        Adds child below node, keyed by the first character of its edge label. A leaf gains a map when it
+        becomes internal.
+        """
+        if self.children[node] is None:
+            self.children[node] = {}
+        self.children[node][ord(self.text[self.edge_start[child]])] = child
+
+    def _sorted_children(self, node):
+        """
+        Returns the children of node in lexicographic order of their edge labels, i.e. by first character code.
+        """
+        children = self.children[node]
+        return [children[code] for code in sorted(children)]
+
     def _edge_insert(self, j):
         """
         Insert internal node at active point. x = aLength,
@@ -153,27 +212,21 @@ class SuffixTree:
         NEW:               |
                     (A)---(C)---(B) aNode = A, aEdge = AC, aLength = AC[0...x]
         """
+        A = self.aNode
+        B = self._child(A, self.aEdge)
 
-        AB = self.aNode.edges[self.aEdge]
-
-        splitStart = AB.start + self.aLength - 1
-        splitEnd = AB.start + self.aLength
-
-        B = AB.tail
-
-        C = Node(link_to=self.root, ID=self.get_node_id())
-        D = Node(
-            link_to=self.root, ID=self.get_node_id(), suffixID=j - self.remainder + 1
-        )
+        splitStart = self.edge_start[B] + self.aLength - 1
+        splitEnd = self.edge_start[B] + self.aLength
 
-        CB = Edge(start=splitEnd, end=AB.end, head=C, tail=B, value=self.text[splitEnd])
-        CD = Edge(start=j, end=-1, head=C, tail=D, value=self.text[j])
+        ## AC takes the first part of the label of AB, and CB keeps the rest
+        C = self._new_node(start=self.edge_start[B], end=splitStart)
+        self._add_child(A, C)  ## replaces AB, as both labels start with the same character
+        self.edge_start[B] = splitEnd
 
-        C.edges[CB.value] = CB
-        C.edges[CD.value] = CD
+        D = self._new_node(start=j, end=GLOBAL_END, suffixID=j - self.remainder + 1)
 
-        AB.tail = C
-        AB.end = splitStart
+        self._add_child(C, B)
+        self._add_child(C, D)
 
         self._suffix_link(C)
         self.last_internal_node = C
@@ -188,39 +241,38 @@ class SuffixTree:
                     (A)---(B) aNode = B, aEdge = None, aLength = 0
         """
         A = self.aNode
-        B = Node(
-            link_to=self.root, ID=self.get_node_id(), suffixID=(j - self.remainder + 1)
-        )
-        AB = Edge(head=A, tail=B, start=j, end=-1, value=self.text[j])
+        B = self._new_node(start=j, end=GLOBAL_END, suffixID=(j - self.remainder + 1))
 
-        A.edges[AB.value] = AB
+        self._add_child(A, B)
         self._suffix_link(A)
         self.last_internal_node = A
 
     def _check_or_insert(self, j):
         """
-        Check if character string[j] exists at active point. If it does not, insert it
+        Check if character string[j] exists at active point. If it does not, insert it. Skip counting walks the
+        active point down one edge per iteration, so long remainders never deepen the call stack.
         """
         currentCharacter = self.text[j]
-        if self.aLength == 0:
-            ## If the character exists as an outgoing edge, it is implicitly represented, so return
-            if currentCharacter in self.aNode.edges.keys():
-                ## Update active edge and length to traverse to end of match
-                self.aEdge = currentCharacter
-                self.aLength = 1
-                return False
+        while True:
+            if self.aLength == 0:
+                ## If the character exists as an outgoing edge, it is implicitly represented, so return
+                if self._child(self.aNode, currentCharacter) != NONE:
+                    ## Update active edge and length to traverse to end of match
+                    self.aEdge = currentCharacter
+                    self.aLength = 1
+                    return False
 
-            else:  ## If it doesn't exist, add the character as a new edge
-                self._node_insert(j)
-                return True
+                else:  ## If it doesn't exist, add the character as a new edge
+                    self._node_insert(j)
+                    return True
 
-        else:  ## Else we are on an edge. Perform skip counting
-            currentEdge = self.aNode.edges[self.aEdge]
-            edgeLength = currentEdge.length(self.end)
+            ## Else we are on an edge. Perform skip counting
+            currentEdge = self._child(self.aNode, self.aEdge)
+            edgeLength = self._edge_length(currentEdge)
 
-            ## If edgeLength <= aLength recurse deeper
+            ## If edgeLength <= aLength skip to the end of the edge and check again from there
             if self.aLength >= edgeLength:
-                self.aNode = currentEdge.tail
+                self.aNode = currentEdge
 
                 ## Calculate next character after fully matching current edge
                 nextPosition = j - self.aLength + edgeLength
@@ -229,24 +281,23 @@ class SuffixTree:
                 )
 
                 self.aLength -= edgeLength
-                return self._check_or_insert(j=j)
+                continue
 
             ## Else check/insert on current edge
+            compareChar = self.edge_start[currentEdge] + self.aLength
+            if self.text[compareChar] == currentCharacter:
+                self.aLength += 1
+                return False
             else:
-                compareChar = currentEdge.start + self.aLength
-                if self.text[compareChar] == currentCharacter:
-                    self.aLength += 1
-                    return False
-                else:
-                    self._edge_insert(j=j)
-                    return True
+                self._edge_insert(j=j)
+                return True
 
     def _suffix_link(self, to_node):
         """
         Resolves unresolved internal node if one exists, via a suffix link
         """
         if self.last_internal_node is not None:
-            self.last_internal_node.link_to = to_node
+            self.link[self.last_internal_node] = to_node
             self.last_internal_node = None
 
     def _perform_phase(self, j):
@@ -276,7 +327,7 @@ class SuffixTree:
                 ## Not at the root node : follow suffix link from active node
                 if self.aNode != self.root:
                     ## Traverse suffix link (back to root if no suffix link)
-                    self.aNode = self.aNode.link_to
+                    self.aNode = self.link[self.aNode]
 
                 ## At root node : stay at root node and decrement active length and increment active edge
                 else:
@@ -294,11 +345,6 @@ class SuffixTree:
             if self.encoderMode:
                 self.frequencies[self.text[j]] += 1
 
-    def _sort_edges(self, edges):
-        """Return edges values based on their value, which presumes lexicographic order. Constant time
-        as number of edges outgoing from a node is bounded by ASCII range"""
-        return sorted(edges.values(), key=lambda e: e.value)
-
     def _dfs(self, node):
         """
         Performs a depth-first search (DFS) on the suffix tree starting from the given node.
@@ -308,46 +354,157 @@ class SuffixTree:
         - In non-encoder mode, it simply assigns ranks to nodes based on their lexicographic order.
         - In encoder mode, it also constructs the Burrows-Wheeler Transform (BWT) by appending the character found at the position (suffixID - 1) % len(text).
 
+        The traversal uses an explicit stack rather than recursion, so trees as deep as the text (such as for
+        aaaa...$) do not hit the recursion limit. The children of an internal node are sorted once, when it is
+        visited, and pushed in reverse so that they pop in lexicographic order.
+
+        In lcpMode, the DFS visits every leaf and also appends each suffix to `self.suffix_array` and its LCP
+        with the previous suffix to `self.lcp`. Each stack entry carries the string depth of the node's parent,
+        and the LCP of two consecutive leaves is the depth of their lowest common ancestor: the shallowest
+        parent of any node visited between them.
+
         Parameters:
-            node (Node): The current node from which the DFS starts or continues.
+            node (int): The ID of the node at which the DFS starts.
 
         Returns:
-            bool: True if the DFS has processed all required indices and can terminate early; otherwise, False.
+            bool: True if the DFS has processed all required indices and terminated early; otherwise, False.
 
         Notes:
             - The method modifies `self.positions` to store ranks of required suffix positions.
             - The method updates `self.bwt` if in encoder mode.
             - The method adjusts `self.remainingIndices` to track the number of remaining indices that need processing.
         """
-        if self.remainingIndices == 0:
-            return True
+        children, suffix_id = self.children, self.suffix_id
+        lcpMode = self.lcpMode
+        start = node
+        stack = [(start, 0)]
+        lcaDepth = 0  ## depth of the shallowest parent visited since the last leaf
+
+        while stack:
+            if self.remainingIndices == 0 and not lcpMode:
+                return True
+
+            node, parentDepth = stack.pop()
+            if parentDepth < lcaDepth:
+                lcaDepth = parentDepth
+
+            ## Internal node: visit children lexicographically, smallest on top of the stack
+            if children[node] is not None:
+                depth = parentDepth + self._edge_length(node) if lcpMode and node != start else 0
+                for child in reversed(self._sorted_children(node)):
+                    stack.append((child, depth))
+                continue
 
-        ## Base Case: If this is a leaf node
-        if not node.edges:
+            ## Leaf node
             self.currentRank += 1
+            suffixID = suffix_id[node]
 
             # If this node is a wanted suffix
-            if node.suffixID in self.positions:
+            if suffixID in self.positions:
 
-                self.positions[node.suffixID] = self.currentRank
+                self.positions[suffixID] = self.currentRank
 
                 ## If in encoderMode, construct the BWT concurrently
                 if self.encoderMode:
-                    self.bwt.append(self.text[(node.suffixID - 1) % len(self.text)])
+                    self.bwt.append(self.text[(suffixID - 1) % len(self.text)])
                 self.remainingIndices -= 1
-            return
-        ## No chance of node having been visited already
-        ## If this node has not yet had its edges sorted, then sort and visit edges
-        if not node.sorted_edges:
-            node.sorted_edges = self._sort_edges(node.edges)
-
-        ## Recursive Case: visit outgoing edges lexicographically
-        for childEdge in node.sorted_edges:
-            if self._dfs(node=childEdge.tail):
-                return True
+
+            if lcpMode:
+                self.suffix_array.append(suffixID)
+                self.lcp.append(lcaDepth)
+                lcaDepth = len(self.text)
 
         return False
 
+    def _preorder(self, node):
+        """
+        Yields the nodes of the subtree rooted at node in lexicographic (pre)order, with the same explicit
+        stack as _dfs.
+        """
+        children = self.children
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if children[node] is not None:
+                stack.extend(reversed(self._sorted_children(node)))
+            yield node
+
+    def _count_leaves(self):
+        """
+        Annotates every node with the number of leaves below it in one pass. Children always come after
+        their parent in preorder, so walking the preorder backwards sees every child before its parent.
+        """
+        children = self.children
+        leaf_count = array("i", [0]) * len(children)
+
+        for node in reversed(list(self._preorder(self.root))):
+            if children[node] is None:
+                leaf_count[node] = 1
+                continue
+            for child in children[node].values():
+                leaf_count[node] += leaf_count[child]
+
+        self.leaf_count = leaf_count
+
+    def _find(self, pattern):
+        """
+        Walks pattern down from the root, skipping to the end of each edge after comparing its label.
+
+        Returns:
+            int: The highest node whose path label starts with pattern, so that the leaves below it are exactly
+            the suffixes prefixed by pattern, or NONE if pattern does not occur. Like the a1 engines, an empty
+            pattern has no occurrences.
+        """
+        if len(pattern) == 0:
+            return NONE
+
+        node = self.root
+        i = 0
+        while i < len(pattern):
+            node = self._child(node, pattern[i])
+            if node == NONE:
+                return NONE
+
+            start = self.edge_start[node]
+            length = min(self._edge_length(node), len(pattern) - i)
+            if self.text[start : start + length] != pattern[i : i + length]:
+                return NONE
+            i += length
+
+        return node
+
+    def count(self, pattern):
+        """
+        Returns the number of occurrences of pattern in the text, in O(m) time once the leaf counts exist.
+        The tree must be built over a text that ends in a unique terminator, so that every suffix is a leaf.
+        """
+        if self.leaf_count is None:
+            self._count_leaves()
+
+        node = self._find(pattern)
+        return 0 if node == NONE else self.leaf_count[node]
+
+    def _leaves(self, node):
+        """
+        Yields the leaves below node lazily, in lexicographic order.
+        """
+        if node == NONE:
+            return
+
+        children = self.children
+        for leaf in self._preorder(node):
+            if children[leaf] is None:
+                yield leaf
+
+    def locate(self, pattern):
+        """
+        Yields the start position of each occurrence of pattern in the text, in 1-indexing, lazily and in
+        lexicographic order of the suffixes that start there.
+        """
+        suffix_id = self.suffix_id
+        for leaf in self._leaves(self._find(pattern)):
+            yield suffix_id[leaf] + 1
+
     def get_sorted_suffixes(self):
         """
         Calculates ranks of each position in the input
@@ -369,6 +526,438 @@ class SuffixTree:
         return self.get_sorted_suffixes()
 
 
+class GeneralizedSuffixTree(SuffixTree):
+    """
+    Generalized suffix tree over several documents
+
+    The documents are concatenated, each followed by a unique terminator from the private use area, and one
+    tree is built over the result. A common prefix of two suffixes can never contain a terminator, as each
+    occurs only once, so every path label above a leaf edge lies within a single document.
+
+    Attributes:
+        fileNames (list of str): The document files. A document ID is an index into this list.
+        document_starts (array('i')): Start of each document in the concatenated text.
+        leaf_document (array('i')): Document of the suffix at each leaf, or NONE for internal nodes.
+        leaf_offset (array('i')): 1-indexed offset of that suffix within its document, or NONE.
+    """
+
+    def __init__(self, fileNames):
+        if len(fileNames) > MAX_DOCUMENTS:
+            raise ValueError(f"at most {MAX_DOCUMENTS} documents can be indexed together")
+
+        self.fileNames = list(fileNames)
+        self.document_starts = array("i")
+        self.document_lengths = array("i")
+
+        parts = []
+        start = 0
+        for documentID, fileName in enumerate(self.fileNames):
+            document = read_file(fileName)
+            reserved = (TERMINATOR_BASE <= ord(character) < TERMINATOR_BASE + MAX_DOCUMENTS for character in set(document))
+            if any(reserved):
+                raise ValueError(f"{fileName} contains private use characters reserved for terminators")
+
+            self.document_starts.append(start)
+            self.document_lengths.append(len(document))
+            parts.append(document)
+            parts.append(chr(TERMINATOR_BASE + documentID))
+            start += len(document) + 1
+
+        self.text = "".join(parts)
+        self.encoderMode = False
+        self.lcpMode = False
+        self.positions = {}
+
+        self._initialise_tree()
+        self.leaf_document = array("i")
+        self.leaf_offset = array("i")
+
+    def build_suffix_tree(self):
+        """
+        Performs all phases in Ukkonens, then tags every leaf with the document and offset of its suffix.
+        """
+        super().build_suffix_tree()
+
+        suffix_id, document_starts = self.suffix_id, self.document_starts
+        self.leaf_document = array("i", [NONE]) * len(suffix_id)
+        self.leaf_offset = array("i", [NONE]) * len(suffix_id)
+        for node, suffixID in enumerate(suffix_id):
+            if suffixID != NONE:
+                documentID = bisect_right(document_starts, suffixID) - 1
+                self.leaf_document[node] = documentID
+                self.leaf_offset[node] = suffixID - document_starts[documentID] + 1
+
+    def locate(self, pattern):
+        """
+        Yields a (document ID, 1-indexed offset) pair for each occurrence of pattern, lazily and in lexicographic
+        order of the suffixes that start there.
+        """
+        for leaf in self._leaves(self._find(pattern)):
+            yield self.leaf_document[leaf], self.leaf_offset[leaf]
+
+    def documents(self, pattern):
+        """
+        Returns the sorted IDs of the documents that contain pattern, in O(m + occ) time.
+        """
+        return sorted({self.leaf_document[leaf] for leaf in self._leaves(self._find(pattern))})
+
+    def longest_common_substring(self, k=None):
+        """
+        Finds the longest substring that occurs in at least k of the documents (by default, all of them).
+
+        A substring common to k documents is a common prefix of a run of consecutive suffixes, in suffix array
+        order, that start in k different documents, and its longest length over that run is the minimum of the
+        LCP array within it. Sliding a window over the suffix array that always holds k documents, and keeping
+        a monotonic queue of its LCP minimum, visits every suffix a constant number of times.
+
+        Returns:
+            str: The longest common substring, or "" if the k documents share no character.
+
+        Time Complexity: O(N) for N the total length of the documents, after an O(N) DFS for the suffix and
+        LCP arrays.
+        """
+        d = len(self.fileNames)
+        k = d if k is None else k
+        if not 1 <= k <= d:
+            raise ValueError(f"k must be between 1 and the number of documents, {d}")
+
+        ## The DFS records the suffix and LCP arrays in lcpMode, which only needs to happen once
+        if len(self.suffix_array) == 0:
+            self.lcpMode = True
+            self._dfs(node=self.root)
+
+        suffix_array, lcp = self.suffix_array, self.lcp
+        document_of = np.repeat(
+            np.arange(d, dtype=np.int32), np.frombuffer(self.document_lengths, dtype=np.int32) + 1
+        )
+
+        counts = [0] * d
+        distinct = 0
+        minimum = deque()  ## ranks in (low, high], with increasing LCP values
+        bestLength, bestStart = 0, 0
+        low = 0
+
+        for high, suffixID in enumerate(suffix_array):
+            documentID = document_of[suffixID]
+            counts[documentID] += 1
+            if counts[documentID] == 1:
+                distinct += 1
+
+            while minimum and lcp[minimum[-1]] >= lcp[high]:
+                minimum.pop()
+            minimum.append(high)
+
+            ## Shrink the window from the left while it still holds k documents without its first suffix
+            while low < high:
+                first = document_of[suffix_array[low]]
+                if counts[first] == 1:
+                    if distinct <= k:
+                        break
+                    distinct -= 1
+                counts[first] -= 1
+                low += 1
+            while minimum and minimum[0] <= low:
+                minimum.popleft()
+
+            if distinct >= k:
+                if minimum:
+                    length = lcp[minimum[0]]
+                else:  ## a single suffix: all of it up to the end of its document
+                    length = self.document_starts[documentID] + self.document_lengths[documentID] - suffixID
+                if length > bestLength:
+                    bestLength, bestStart = length, suffixID
+
+        return self.text[bestStart : bestStart + bestLength]
+
+
+class SuffixArray:
+    """
+    Suffix array implementation, with the same interface and output as SuffixTree
+
+    Suffixes are sorted by prefix doubling: after the round for k, rank[i] is the rank of s[i...i+2k-1]
+    among all substrings of that length, so sorting on the pair (rank[i], rank[i+k]) gives the ranks for 2k.
+    Each round is one NumPy argsort, and the rounds stop as soon as every rank is distinct.
+
+    Attributes:
+        suffix_array (array('i')): suffix_array[r] is the start of the suffix of rank r + 1.
+        lcp (array('i')): In lcpMode, lcp[r] is the LCP of the suffixes of ranks r and r + 1 (lcp[0] = 0).
+    """
+
+    def __init__(self, stringFileName, positionsFileName, encoderMode=False, lcpMode=False):
+        self.text = read_file(stringFileName)
+        self.encoderMode = encoderMode
+        self.lcpMode = lcpMode
+
+        # Encoder mode specifics: the BWT is read straight off the suffix array, so no positions are tracked
+        if self.encoderMode:
+            self.positions = {}
+            self.frequencies = defaultdict(lambda: 0)
+            self.bwt = []
+        else:
+            self.positions = {
+                (int(position) - 1): None
+                for position in read_positions(positionsFileName)
+            }
+
+        self.suffix_array = array("i")
+        self.lcp = array("i")
+
+    def build_suffix_array(self):
+        """
+        Sorts the suffixes of the text (see construct_suffix_array).
+        """
+        if self.encoderMode:
+            self.frequencies.update(Counter(self.text))
+
+        self.suffix_array = construct_suffix_array(self.text)
+        if self.lcpMode:
+            self.lcp = construct_lcp_array(self.text, self.suffix_array)
+
+    def get_sorted_suffixes(self):
+        """
+        Calculates ranks of each position in the input
+        """
+        rank = np.empty(len(self.suffix_array), dtype=np.int64)
+        rank[np.frombuffer(self.suffix_array, dtype=np.int32)] = np.arange(1, len(self.suffix_array) + 1)
+        with open("output_q1.txt", "a") as file:
+            for index in self.positions:
+                self.positions[index] = int(rank[index])
+                file.write(f"{self.positions[index]}\n")
+
+    def get_bwt(self):
+        text = self.text
+        self.bwt = [text[suffixID - 1] for suffixID in self.suffix_array]
+        return self.bwt
+
+    def get_frequency_count(self):
+        return self.frequencies
+
+    def run(self):
+        self.build_suffix_array()
+        return self.get_sorted_suffixes()
+
+
+def construct_suffix_array(text):
+    """
+    Sorts the suffixes of text by prefix doubling (see SuffixArray).
+
+    Returns:
+        suffix_array (array('i')): suffix_array[r] is the start of the suffix of rank r + 1.
+
+    Time Complexity: O(n log^2 n) in the worst case, and O(n log n log L) where L is the longest repeat.
+    """
+    n = len(text)
+    if n == 0:
+        return array("i")
+
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype="<u4")
+    ## Ranks start at 1, so that 0 can stand for the empty string past the end of the text
+    rank = np.unique(codes, return_inverse=True)[1].astype(np.int64) + 1
+    order = np.argsort(rank, kind="stable")
+
+    k = 1
+    while rank[order[-1]] < n:
+        second = np.zeros(n, dtype=np.int64)
+        second[: n - k] = rank[k:]
+        key = rank * (n + 1) + second
+
+        order = np.argsort(key, kind="stable")
+        sorted_key = key[order]
+        rank = np.empty(n, dtype=np.int64)
+        rank[order[0]] = 1
+        rank[order[1:]] = 1 + np.cumsum(sorted_key[1:] != sorted_key[:-1])
+        k *= 2
+
+    return array("i", order.astype(np.int32).tobytes())
+
+
+def construct_lcp_array(text, suffix_array):
+    """
+    Constructs the LCP array of text from its suffix array by Kasai's algorithm. Suffixes are visited in text
+    order, and the LCP of suffix i with its predecessor in the suffix array is at least one less than that of
+    suffix i - 1, so the common prefix is only ever extended from where the last one stopped.
+
+    Returns:
+        lcp (array('i')): lcp[r] is the LCP of the suffixes suffix_array[r - 1] and suffix_array[r], and
+        lcp[0] = 0.
+
+    Time Complexity: O(n)
+    """
+    n = len(text)
+    rank = array("i", [0]) * n
+    for r, i in enumerate(suffix_array):
+        rank[i] = r
+
+    lcp = array("i", [0]) * n
+    h = 0
+    for i in range(n):
+        r = rank[i]
+        if r == 0:
+            h = 0
+            continue
+        j = suffix_array[r - 1]
+        while i + h < n and j + h < n and text[i + h] == text[j + h]:
+            h += 1
+        lcp[r] = h
+        if h > 0:
+            h -= 1
+
+    return lcp
+
+
+class LCEIndex:
+    """
+    Longest common extension queries over the suffixes of a text in O(1), by range minimum queries on its LCP
+    array: the LCP of two suffixes is the minimum of the LCP array strictly after the lower rank, up to and
+    including the higher one.
+
+    The sparse table holds, at level k, the minimum of every window of 2^k LCP values, so any range is covered
+    by two overlapping windows of the largest power of two that fits. It takes O(n log n) space.
+
+    Attributes:
+        rank (np.ndarray): rank[i] is the 0-indexed rank of the suffix starting at i.
+        table (list of np.ndarray): table[k][r] is the minimum of lcp[r...r+2^k-1].
+    """
+
+    def __init__(self, suffix_array, lcp):
+        self.n = len(suffix_array)
+        self.rank = np.empty(self.n, dtype=np.int32)
+        self.rank[np.frombuffer(suffix_array, dtype=np.int32)] = np.arange(self.n, dtype=np.int32)
+
+        self.table = [np.frombuffer(lcp, dtype=np.int32)]
+        width = 1
+        while 2 * width <= self.n:
+            level = self.table[-1]
+            self.table.append(np.minimum(level[:-width], level[width:]))
+            width *= 2
+
+    def range_minimum(self, low, high):
+        """Returns the minimum of lcp[low...high], for low <= high."""
+        k = (high - low + 1).bit_length() - 1
+        return int(min(self.table[k][low], self.table[k][high - (1 << k) + 1]))
+
+    def lce(self, i, j):
+        """Returns the length of the longest common prefix of the suffixes starting at i and j (0-indexed)."""
+        if i == j:
+            return self.n - i
+        low, high = sorted((int(self.rank[i]), int(self.rank[j])))
+        return self.range_minimum(low + 1, high)
+
+
+def longest_repeated_substring(text, suffix_array, lcp):
+    """
+    Returns the longest substring of text that occurs at least twice, or "" if no character repeats. The
+    longest repeat is a common prefix of two suffixes that are adjacent in the suffix array, so it is the
+    maximum of the LCP array.
+    """
+    if len(lcp) == 0:
+        return ""
+    r = max(range(len(lcp)), key=lcp.__getitem__)
+    return text[suffix_array[r] : suffix_array[r] + lcp[r]]
+
+
+class SuffixIndex:
+    """
+    Read-only view of a saved suffix index file, memory-mapped so that only the pages touched by queries
+    are read from disk.
+
+    Attributes:
+        n (int): Length of the indexed text.
+        digest (bytes): SHA-256 of the indexed text.
+        suffix_array (np.ndarray): suffix_array[r] is the start of the suffix of rank r + 1.
+        inverse (np.ndarray): inverse[i] + 1 is the rank of the suffix starting at i.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._map) < INDEX_HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is too short to be a suffix index")
+        magic, version, self.digest, self.n = INDEX_HEADER.unpack_from(self._map)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {INDEX_VERSION} suffix index")
+        if len(self._map) != INDEX_HEADER.size + 8 * self.n:
+            self.close()
+            raise ValueError(f"{path} is truncated")
+
+        self.suffix_array = np.frombuffer(self._map, dtype="<i4", count=self.n, offset=INDEX_HEADER.size)
+        self.inverse = np.frombuffer(
+            self._map, dtype="<i4", count=self.n, offset=INDEX_HEADER.size + 4 * self.n
+        )
+
+    def rank(self, position):
+        """Returns the 1-indexed rank of the suffix starting at the 0-indexed position, in O(1)."""
+        return int(self.inverse[position]) + 1
+
+    def close(self):
+        ## The arrays export the map's buffer, so they must go before it can close
+        self.suffix_array = self.inverse = None
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def text_digest(text):
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+def index_path(text, directory=INDEX_DIRECTORY):
+    """Returns the path of the suffix index file for text, which is named after its hash."""
+    return os.path.join(directory, text_digest(text).hex() + ".sfx")
+
+
+def save_suffix_index(text, suffix_array, path):
+    """
+    Writes the suffix index of text to path. The file is written under a temporary name and then renamed,
+    so a concurrent reader never maps a partial index.
+
+    Parameters:
+        text (str): The indexed text.
+        suffix_array (array('i')): Its suffix array, as built by SuffixArray.
+        path (str): Where to write the index.
+    """
+    n = len(text)
+    suffix_array = np.frombuffer(suffix_array, dtype=np.int32).astype("<i4")
+    inverse = np.empty(n, dtype="<i4")
+    inverse[suffix_array] = np.arange(n, dtype="<i4")
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, text_digest(text), n))
+        file.write(suffix_array.tobytes())
+        file.write(inverse.tobytes())
+    os.replace(temporary_path, path)
+
+
+def load_suffix_index(stringFileName, directory=INDEX_DIRECTORY):
+    """
+    Returns the SuffixIndex of the text in stringFileName, building and saving it first unless a valid index
+    for the same text already exists in directory.
+    """
+    text = read_file(stringFileName)
+    path = index_path(text, directory)
+
+    if os.path.exists(path):
+        try:
+            index = SuffixIndex(path)
+            if index.digest == text_digest(text) and index.n == len(text):
+                return index
+            index.close()
+        except ValueError:
+            pass  ## an older version or a damaged file: rebuild it
+
+    save_suffix_index(text, construct_suffix_array(text), path)
+    return SuffixIndex(path)
+
+
 def read_file(file_path: str) -> str:
     with open(file_path, "r", encoding="utf-8") as file:
         return file.read()
@@ -383,6 +972,12 @@ def read_positions(positionsFileName):
 if __name__ == "__main__":
     output_file_name = "output_q1.txt"
     open(output_file_name, "wb").close()
-    _, stringFileName, positionsFileName = sys.argv
-    sTree = SuffixTree(stringFileName, positionsFileName, encoderMode=False)
-    sTree.run()
+    stringFileName, positionsFileName = sys.argv[1:3]
+    if sys.argv[3:] == ["--index"]:
+        with load_suffix_index(stringFileName) as index, open(output_file_name, "a") as file:
+            ## Deduplicate on the parsed positions, as SuffixTree does, so "5" and "05" are one position
+            for position in dict.fromkeys(int(position) - 1 for position in read_positions(positionsFileName)):
+                file.write(f"{index.rank(position)}\n")
+    else:
+        sTree = SuffixTree(stringFileName, positionsFileName, encoderMode=False)
+        sTree.run()